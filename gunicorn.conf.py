@@ -0,0 +1,11 @@
+import msvdd_bloc.resumes.parse
+
+
+# load the app once in the master process, then fork workers from it
+preload_app = True
+
+
+def when_ready(server):
+    # load and exercise all parsing models before any workers are forked,
+    # so that they're shared copy-on-write and ready to serve the first request
+    msvdd_bloc.resumes.parse.warm_up()
@@ -1,3 +1,4 @@
+import importlib
 import pathlib
 
 ROOT_DIR = pathlib.Path(__file__).parent.parent.resolve()
@@ -5,10 +6,17 @@ DATA_DIR = ROOT_DIR.joinpath("data")
 MODELS_DIR = ROOT_DIR.joinpath("models")
 
 from .about import __version__
-from . import fileio
-from . import job_postings
-from . import regexes
-from . import resumes
-from . import schemas
-from . import tokenize
-from . import utils
+
+# subpackages and modules are only imported on first access, so that e.g. parsing résumés
+# doesn't pay for importing the dependencies of fetching job postings, and vice versa
+_SUBMODULES = {"fileio", "job_postings", "regexes", "resumes", "schemas", "tokenize", "utils"}
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
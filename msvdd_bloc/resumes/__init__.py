@@ -1,7 +1,44 @@
-from .extract import extract_text_from_pdf
-from .munge import normalize_text, get_filtered_text_lines
-from .parse import parse_text
-from .segment import get_section_lines
-from . import augment_utils
-from . import generate_utils
-from . import parse_utils
+import importlib
+
+# modules, and the public names re-exported from them, are only imported on first access,
+# so that e.g. parsing résumés doesn't pay for importing the dependencies of extracting
+# their text from PDFs or generating fake training data
+_ATTR_MODULES = {
+    "ParseCache": "cache",
+    "extract_text_from_pdf": "extract",
+    "normalize_text": "munge",
+    "get_filtered_text_lines": "munge",
+    "parse_text": "parse",
+    "parse_texts": "parse",
+    "get_section_lines": "segment",
+}
+_SUBMODULES = {
+    "augment_utils",
+    "basics",
+    "cache",
+    "constants",
+    "education",
+    "extract",
+    "generate_utils",
+    "munge",
+    "parse",
+    "parse_utils",
+    "segment",
+    "skills",
+    "work",
+}
+
+
+def __getattr__(name):
+    if name in _ATTR_MODULES:
+        module = importlib.import_module("." + _ATTR_MODULES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    elif name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_ATTR_MODULES) | _SUBMODULES)
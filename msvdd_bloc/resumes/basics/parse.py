@@ -1,17 +1,23 @@
 import itertools
 import logging
 import operator
+import re
 
 import probablepeople
 import usaddress
-from toolz import itertoolz
 
-from msvdd_bloc import regexes, tokenize
+from msvdd_bloc import regexes, tokenize, utils
 from msvdd_bloc.resumes import basics
 from msvdd_bloc.resumes import parse_utils
 
 
 LOGGER = logging.getLogger(__name__)
+_LEXICAL_FEATURES_CACHE = utils.LRUCache(maxsize=4096)
+# the same locations and names turn up in résumé after résumé, and tagging them is costly
+_LOCATION_TAGS_CACHE = utils.LRUCache(maxsize=4096)
+_NAME_TAGS_CACHE = utils.LRUCache(maxsize=4096)
+_RE_TAG_TEXT_SPACES = re.compile(r"[^\S\n]+")
+_MISSING = object()
 
 #######################
 ## CRF-BASED PARSING ##
@@ -21,7 +27,7 @@ FIELD_SEP_TEXTS = set(basics.constants.FIELD_SEPS)
 ITEM_SEP_TEXTS = set(basics.constants.ITEM_SEPS)
 
 
-def parse_lines(lines, tagger=None):
+def parse_lines(lines, tagger=None, *, stats=None):
     """
     Parse a sequence of text lines belonging to the "basics" section of a résumé
     to produce structured data in the form of :class:`schemas.ResumeBasicsSchema`
@@ -30,17 +36,52 @@ def parse_lines(lines, tagger=None):
     Args:
         lines (List[str])
         tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
+
+    Returns:
+        Dict[str, obj]
+
+    See Also:
+        :func:`parse_tokens()`
+    """
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+
+    with stats.timer("basics.tokenize"):
+        tokens = tokenize.tokenize("\n".join(lines).strip())
+    stats.count("basics.n_lines", len(lines))
+    return parse_tokens(tokens, tagger=tagger, stats=stats)
+
+
+def parse_tokens(tokens, tagger=None, *, stats=None):
+    """
+    Parse a sequence of tokens belonging to the "basics" section of a résumé
+    to produce structured data in the form of :class:`schemas.ResumeBasicsSchema`
+    using trained Conditional Random Field (CRF) taggers.
+
+    Args:
+        tokens (List[:class:`spacy.tokens.Token`]): Section's lines joined by newlines,
+            stripped, then tokenized, e.g. via :func:`tokenize.tokenize_sections()`.
+        tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
 
     Returns:
         Dict[str, obj]
     """
     if tagger is None:
         tagger = parse_utils.load_tagger(basics.FPATH_TAGGER)
+    if stats is None:
+        stats = parse_utils.NULL_STATS
 
-    tokens = tokenize.tokenize("\n".join(lines).strip())
-    features = featurize(tokens)
-    labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
-    data = _parse_labeled_tokens(labeled_tokens)
+    with stats.timer("basics.featurize"):
+        features = featurize(tokens)
+    with stats.timer("basics.tag"):
+        labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
+    with stats.timer("basics.parse_labeled_tokens"):
+        data = _parse_labeled_tokens(labeled_tokens)
+    stats.count("basics.n_tokens", len(tokens))
     return data
 
 
@@ -61,14 +102,10 @@ def _parse_labeled_tokens(labeled_tokens):
         if label in excluded_labels:
             continue
         elif label == "location":
-            try:
-                location, location_type = usaddress.tag(
-                    field_text.replace("\n", " "),
-                    tag_mapping=basics.constants.LOCATION_TAG_MAPPING,
-                )
-            except usaddress.RepeatedLabelError as e:
-                LOGGER.debug("'location' parsing error:\n%s", e)
+            tagged = _tag_location(field_text.replace("\n", " "))
+            if tagged is None:
                 continue
+            location, location_type = tagged
             if location_type == "Street Address":
                 location = dict(location)
                 if "recipient" in location:
@@ -91,6 +128,84 @@ def _parse_labeled_tokens(labeled_tokens):
     return data
 
 
+def _tag_location(text):
+    """
+    Tag ``text`` as a location via :func:`usaddress.tag()`, memoizing results.
+
+    Args:
+        text (str)
+
+    Returns:
+        Tuple[Dict[str, str], str] or None: Tagged location components and location type,
+        or None if ``text`` couldn't be tagged without repeated labels.
+        Results are shared between calls, so don't modify them in-place.
+    """
+    return _tag_cached(
+        text,
+        lambda text: usaddress.tag(text, tag_mapping=basics.constants.LOCATION_TAG_MAPPING),
+        usaddress.RepeatedLabelError,
+        _LOCATION_TAGS_CACHE,
+        "location",
+    )
+
+
+def _tag_name(text):
+    """
+    Tag ``text`` as a name via :func:`probablepeople.tag()`, memoizing results.
+
+    Args:
+        text (str)
+
+    Returns:
+        Tuple[Dict[str, str], str] or None: Tagged name components and name type,
+        or None if ``text`` couldn't be tagged without repeated labels.
+        Results are shared between calls, so don't modify them in-place.
+    """
+    return _tag_cached(
+        text, probablepeople.tag, probablepeople.RepeatedLabelError, _NAME_TAGS_CACHE, "name",
+    )
+
+
+def _tag_cached(text, tag_func, error_type, cache, field):
+    """
+    Args:
+        text (str)
+        tag_func (Callable[[str], Tuple[Dict[str, str], str]])
+        error_type (Type[Exception])
+        cache (:class:`utils.LRUCache`)
+        field (str)
+
+    Returns:
+        Tuple[Dict[str, str], str] or None
+
+    Note:
+        Both taggers split text into tokens on whitespace (though ``usaddress``
+        keeps newlines attached to tokens), so collapsing other whitespace
+        doesn't change their outputs, and lets more texts share a cache entry.
+    """
+    key = _RE_TAG_TEXT_SPACES.sub(" ", text).strip(" ")
+    tagged = cache.get(key, _MISSING)
+    if tagged is _MISSING:
+        try:
+            tagged = tag_func(key)
+        except error_type as e:
+            LOGGER.debug("'%s' parsing error:\n%s", field, e)
+            tagged = None
+        cache.set(key, tagged)
+    return tagged
+
+
+def get_tag_cache_info():
+    """
+    Get hit and miss counts plus sizes of the process-wide caches of
+    tagged locations and names.
+
+    Returns:
+        Dict[str, Dict[str, int]]
+    """
+    return {"location": _LOCATION_TAGS_CACHE.info(), "name": _NAME_TAGS_CACHE.info()}
+
+
 def featurize(tokens):
     """
     Get features from individual tokens as well as those that are dependent on
@@ -100,42 +215,32 @@ def featurize(tokens):
         tokens (List[:class:`spacy.tokens.Token`])
 
     Returns:
-        List[Dict[str, obj]]
+        :class:`pycrfsuite.ItemSequence`
     """
-    tokens_features = [get_token_features(token) for token in tokens]
-    if len(tokens_features) == 1:
-        tokens_features[0]["_singleton"] = True
-        return tokens_features
+    tokens_lex_features = parse_utils.get_lexical_features(
+        tokens, get_token_features, cache=_LEXICAL_FEATURES_CACHE)
+    if len(tokens_lex_features) == 1:
+        return parse_utils.get_feature_items(tokens_lex_features)
     else:
-        feature_sequence = []
+        tokens_features = [features for features, _, _ in tokens_lex_features]
+        # add features dependent on each token's position within the sequence
+        # and its relationship to other tokens; those of its surrounding tokens
+        # are added for context when flattening into items
+        tokens_seq_features = []
         line_idx_windows = parse_utils.get_line_token_idxs(tokens_features)
         prev_line_idx, next_line_idx = next(line_idx_windows)
         follows_bullet = False
-        n_pad_l, n_pad_r = 3, 2
-        tokens_features = parse_utils.pad_tokens_features(
-            tokens_features, n_left=n_pad_l, n_right=n_pad_r)
-        tf_windows = itertoolz.sliding_window(n_pad_l + n_pad_r + 1, tokens_features)
-        for ppprev_tf, pprev_tf, prev_tf, tf, next_tf, nnext_tf in tf_windows:
-            tf = tf.copy()
-            # add features from surrounding tokens, for context
-            tf["ppprev"] = ppprev_tf
-            tf["pprev"] = pprev_tf
-            tf["prev"] = prev_tf
-            tf["next"] = next_tf
-            tf["nnext"] = nnext_tf
-            # add features dependent on this token's position within the sequence
-            # and its relationship to other tokens
-            tok_idx = tf["idx"]
-            if tf["is_newline"] and tf["idx"] > 0:
+        for tok_idx, tf in enumerate(tokens_features):
+            if tf["is_newline"] and tok_idx > 0:
                 prev_line_idx, next_line_idx = next(line_idx_windows)
                 follows_bullet = False
-            tf["tok_line_idx"] = tok_idx - prev_line_idx
-            tf["follows_bullet"] = follows_bullet
+            tok_line_idx = tok_idx - prev_line_idx
+            seq_tf = {"tok_line_idx": tok_line_idx, "follows_bullet": follows_bullet}
             # is this token a bullet? i.e. "- " token starting a new line
-            if tf["shape"] == "-" and tf["tok_line_idx"] == 1:
+            if tf["shape"] == "-" and tok_line_idx == 1:
                 follows_bullet = True
-            feature_sequence.append(tf)
-        return feature_sequence
+            tokens_seq_features.append(seq_tf)
+        return parse_utils.get_feature_items(tokens_lex_features, tokens_seq_features)
 
 
 def get_token_features(token):
@@ -222,23 +327,20 @@ def parse_lines_rules_based_version(lines):
                     else:
                         line_chunk = line_chunk[:start] + line_chunk[end:]
             if "location" not in data:
-                try:
-                    location, location_type = usaddress.tag(
-                        line_chunk, tag_mapping=basics.constants.LOCATION_TAG_MAPPING)
-                except usaddress.RepeatedLabelError as e:
-                    LOGGER.debug("'location' parsing error:\n%s", e)
+                tagged = _tag_location(line_chunk)
+                if tagged is None:
                     continue
+                location, location_type = tagged
                 if location_type == "Street Address":
                     location = dict(location)
                     if "recipient" in location:
                         data["name"] = location.pop("recipient")
                     data["location"] = location
             if "name" not in data:
-                try:
-                    name, name_type = probablepeople.tag(line_chunk)
-                except probablepeople.RepeatedLabelError as e:
-                    LOGGER.debug("'name' parsing error:\n%s", e)
+                tagged = _tag_name(line_chunk)
+                if tagged is None:
                     continue
+                name, name_type = tagged
                 if name_type == "Person":
                     data["name"] = " ".join(name.values())
     return data
@@ -0,0 +1,229 @@
+"""
+cache
+-----
+
+Cache parsed résumé data by the contents of the PDF file from which it was extracted,
+so that repeated uploads of the same file skip extraction and parsing entirely.
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import pathlib
+import tempfile
+
+from msvdd_bloc import __version__, utils
+from msvdd_bloc.resumes import basics, education, skills, work
+from msvdd_bloc.resumes import parse
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    Two-tier cache of parsed résumé data: a bounded, in-memory LRU tier backed by
+    an optional on-disk tier that's shared across processes and evicts its oldest
+    entries once it exceeds a given total size.
+
+    Entries are keyed by a hash of the PDF file's raw bytes plus the package
+    and parsing pipeline versions, the state of the trained section tagger files,
+    and any extraction settings, so any change to the pipeline (as recorded by
+    :obj:`parse.PIPELINE_VERSION`) or a tagger model automatically invalidates
+    all previously cached results.
+
+    Args:
+        dirpath (str or :class:`pathlib.Path`): Directory in which on-disk entries
+            are saved. If None, only the in-memory tier is used.
+        maxsize (int): Maximum number of entries held in memory.
+        max_disk_size (int): Maximum total size in bytes of entries saved on disk.
+        model_filepaths (List[str] or List[:class:`pathlib.Path`]): Paths to the
+            trained tagger files whose state is included in cache keys. If None,
+            the taggers for all résumé sections are used.
+
+    Example::
+
+        >>> cache = ParseCache(dirpath="./data/cache")
+        >>> key = cache.make_key(data, settings={"timeout": 10.0})
+        >>> result = cache.get(key)
+        >>> if result is None:
+        ...     result = parse_text(extract_text_from_pdf(data, timeout=10.0))
+        ...     cache.set(key, result)
+
+    Note:
+        Cached results are returned as-is rather than copied, so callers should
+        treat them as read-only.
+    """
+
+    def __init__(self, dirpath=None, *, maxsize=256, max_disk_size=256 * 1024 ** 2, model_filepaths=None):
+        self.dirpath = pathlib.Path(dirpath).resolve() if dirpath else None
+        self.max_disk_size = max_disk_size
+        self.model_filepaths = [
+            str(fpath) for fpath in (
+                model_filepaths or
+                [module.FPATH_TAGGER for module in (basics, education, skills, work)]
+            )
+        ]
+        self._memory = utils.LRUCache(maxsize=maxsize)
+        self._models_version = None
+        if self.dirpath:
+            self.dirpath.mkdir(parents=True, exist_ok=True)
+            self._disk_size = sum(size for _, size, _ in self._iter_disk_entries())
+        else:
+            self._disk_size = 0
+
+    def make_key(self, data, *, settings=None):
+        """
+        Make a cache key for a PDF file's raw ``data``, reflecting the current state
+        of the package, its parsing pipeline, and its trained taggers.
+
+        Args:
+            data (bytes)
+            settings (Dict[str, object]): Settings with which ``data`` is extracted
+                and parsed that may affect results, e.g. the keyword arguments passed
+                to :func:`extract.extract_text_from_pdf()`. Must be JSON-serializable.
+
+        Returns:
+            str
+        """
+        version = self._get_models_version()
+        if settings:
+            settings_str = json.dumps(settings, sort_keys=True)
+            version = hashlib.sha256(
+                (version + settings_str).encode("utf-8")).hexdigest()[:12]
+        return "{}-{}".format(hashlib.sha256(data).hexdigest(), version)
+
+    def get(self, key):
+        """
+        Get the parsed résumé cached for ``key``, first from memory then from disk.
+
+        Args:
+            key (str): As produced by :meth:`ParseCache.make_key()`.
+
+        Returns:
+            Dict[str, object] or None: Parsed résumé data, or None if not cached.
+        """
+        result = self._memory.get(key)
+        if result is not None or self.dirpath is None:
+            return result
+        fpath = self.dirpath.joinpath(key + ".json")
+        try:
+            with io.open(fpath, mode="rt", encoding="utf-8") as f:
+                result = json.load(f)
+        except (IOError, ValueError):
+            return None
+        # mark this entry as recently used, so it's evicted from disk last
+        try:
+            os.utime(str(fpath))
+        except OSError:
+            LOGGER.warning("unable to mark cache entry %s as recently used", key)
+        self._memory.set(key, result)
+        return result
+
+    def set(self, key, result):
+        """
+        Cache a parsed résumé ``result`` for ``key``, in memory and, if configured, on disk.
+
+        Args:
+            key (str): As produced by :meth:`ParseCache.make_key()`.
+            result (Dict[str, object])
+        """
+        self._memory.set(key, result)
+        if self.dirpath is None:
+            return
+        # write to a temp file then rename it, so other processes never see partial entries
+        content = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        fd, tmp_fpath = tempfile.mkstemp(dir=str(self.dirpath), suffix=".tmp")
+        try:
+            with io.open(fd, mode="wb") as f:
+                f.write(content)
+            os.replace(tmp_fpath, str(self.dirpath.joinpath(key + ".json")))
+        except OSError:
+            LOGGER.exception("unable to save cache entry %s to disk", key)
+            _remove_file(tmp_fpath)
+            return
+        self._disk_size += len(content)
+        if self._disk_size > self.max_disk_size:
+            self._evict_disk_entries()
+
+    def clear(self):
+        """Remove all entries from the cache, in memory and on disk."""
+        self._memory.clear()
+        if self.dirpath:
+            for fpath, _, _ in self._iter_disk_entries():
+                _remove_file(fpath)
+            self._disk_size = 0
+
+    def info(self):
+        """
+        Returns:
+            Dict[str, int]: Hits, misses, and sizes of the cache's in-memory tier,
+            plus the total size in bytes of its on-disk tier.
+        """
+        info = self._memory.info()
+        info["disk_size"] = self._disk_size
+        return info
+
+    def _get_models_version(self):
+        """
+        Get a short digest of the package and parsing pipeline versions plus the sizes
+        and modification times of all tagger model files; if it's changed since the last
+        call, clear the in-memory tier, since none of its entries can be hit anymore.
+
+        Note:
+            :func:`parse_utils.load_tagger()` re-reads model files whenever their sizes
+            or modification times change, so this reflects the models that are
+            actually used to parse results cached under the new version.
+        """
+        stats = [__version__, "pipeline:{}".format(parse.PIPELINE_VERSION)]
+        for fpath in self.model_filepaths:
+            try:
+                stat = os.stat(fpath)
+                stats.append("{}:{}:{}".format(fpath, stat.st_size, stat.st_mtime_ns))
+            except OSError:
+                stats.append("{}:missing".format(fpath))
+        models_version = hashlib.sha256("|".join(stats).encode("utf-8")).hexdigest()[:12]
+        if models_version != self._models_version:
+            if self._models_version is not None:
+                LOGGER.info("tagger models have changed; invalidating cached parse results")
+                self._memory.clear()
+            self._models_version = models_version
+        return models_version
+
+    def _iter_disk_entries(self):
+        """
+        Yields:
+            Tuple[str, int, float]: Next on-disk entry's (filepath, size, modification time).
+        """
+        for entry in os.scandir(str(self.dirpath)):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield (entry.path, stat.st_size, stat.st_mtime)
+
+    def _evict_disk_entries(self):
+        """
+        Remove the least-recently used on-disk entries until their total size is
+        comfortably below the limit, so eviction isn't triggered on every new entry.
+        """
+        entries = sorted(self._iter_disk_entries(), key=lambda entry: entry[2])
+        disk_size = sum(size for _, size, _ in entries)
+        target_size = int(0.9 * self.max_disk_size)
+        for fpath, size, _ in entries:
+            if disk_size <= target_size:
+                break
+            if _remove_file(fpath):
+                disk_size -= size
+        self._disk_size = disk_size
+
+
+def _remove_file(fpath):
+    try:
+        os.remove(fpath)
+        return True
+    # another process may have removed it already
+    except OSError:
+        return False
@@ -2,10 +2,10 @@
 education
 ---------
 """
+import importlib as _importlib
+
 from msvdd_bloc import MODELS_DIR as _MDIR
-from . import augment
 from . import constants
-from . import generate
 from . import parse
 
 
@@ -27,3 +27,10 @@ LABELS = (
 """
 Tuple[str]: Collection of labels applied to field values when parsing "education" section.
 """
+
+
+def __getattr__(name):
+    # only import data augmentation and generation modules (and their deps) if needed
+    if name in ("augment", "generate"):
+        return _importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -3,62 +3,308 @@ extract
 -------
 
 Extract résumé text from a PDF file, using multiple methods applied in order of confidence.
+PDFs may be given as a path to a file on disk, as raw bytes, or as a binary file-like
+object, so that e.g. uploaded files can be handled without a round-trip to disk.
 """
+import concurrent.futures
+import contextlib
+import functools
+import importlib.util
 import io
+import logging
+import os
+import tempfile
+import threading
+import time
 
 import pdfminer.converter
 import pdfminer.layout
 import pdfminer.pdfinterp
 import pdfminer.pdfpage
-from tika import parser as tika_parser
 
+from msvdd_bloc.resumes import segment
 
-def extract_text_from_pdf(filepath, *, min_len=150):
+
+LOGGER = logging.getLogger(__name__)
+
+# extraction methods that depend on optional packages, which may not be installed;
+# since checking for a package doesn't import it, this is cheap to do up front
+_OPTIONAL_PACKAGES = {"tika": "tika", "textract": "textract"}
+_UNAVAILABLE_METHODS = frozenset(
+    name for name, package in _OPTIONAL_PACKAGES.items()
+    if importlib.util.find_spec(package) is None
+)
+if _UNAVAILABLE_METHODS:
+    LOGGER.debug(
+        "skipping text extraction methods whose packages aren't installed: %s",
+        sorted(_UNAVAILABLE_METHODS))
+
+
+def extract_text_from_pdf(
+    source,
+    *,
+    min_len=150,
+    min_score=0.6,
+    timeout=None,
+    max_pages=10,
+    max_chars=None,
+    return_score=False,
+):
     """
-    Extract text from a PDF at ``filepath`` using the first package
-    to get the job done in extracting at least ``min_len`` chars.
+    Extract text from a PDF ``source`` using the first package
+    to get the job done in extracting at least ``min_len`` chars
+    whose quality scores at least ``min_score``.
+
+    If no package's text is good enough, fall back to the best-scoring text
+    that's at least ``min_len`` chars long, if any.
 
     Args:
-        filepath (str)
+        source (str or :class:`pathlib.Path` or bytes or file-like): Path to a PDF file
+            on disk, the file's raw contents, or a binary file-like object.
         min_len (int)
+        min_score (float): Minimum quality score, as computed by
+            :func:`score_text_quality()`, for a package's text to be accepted outright.
+        timeout (float or Dict[str, float]): Maximum number of seconds to wait
+            for each extraction method, either the same for all or keyed by method
+            name ("tika", "pdfminer", or "textract"). If specified, all methods are
+            run concurrently rather than one after another, and the result of the
+            highest-priority method that finishes in time is returned;
+            otherwise, methods are run in order and without any time limit.
+            Methods that time out are stopped as far as possible: tika's request
+            to its server times out, and pdfminer stops at its next page;
+            textract, however, can't be interrupted.
+        max_pages (int): Maximum number of pages from which text is extracted,
+            so that extremely long documents don't tie up extraction; résumés rarely
+            run longer than a few pages. If None, all pages are processed.
+        max_chars (int): Stop extracting text after the page on which
+            this many characters have been reached. If None, there's no limit.
+        return_score (bool): If True, also return the extracted text's quality score.
 
     Returns:
-        str
+        str or Tuple[str, float]
+
+    Note:
+        Methods whose optional packages (tika, textract) aren't installed are skipped.
+
+        Only pdfminer can stop early once ``max_pages`` or ``max_chars`` is reached.
+        textract's output is truncated to the same budgets before it's scored,
+        but pdftotext still processes the whole document. tika offers no way to limit
+        either, and its text has no page breaks, so the budgets don't apply to it.
     """
-    text = ""
+    # file-likes can only be read through once, but we may need multiple passes
+    if _is_file_like(source):
+        source = source.read()
+    pdfminer_stop = threading.Event()
     funcs = (
-        extract_text_from_pdf_tika,
-        extract_text_from_pdf_pdfminer,
-        extract_text_from_pdf_textract,
+        (
+            "tika",
+            functools.partial(
+                extract_text_from_pdf_tika, timeout=_get_method_timeout(timeout, "tika")),
+        ),
+        (
+            "pdfminer",
+            functools.partial(
+                extract_text_from_pdf_pdfminer,
+                max_pages=max_pages,
+                max_chars=max_chars,
+                stop=pdfminer_stop,
+            ),
+        ),
+        (
+            "textract",
+            functools.partial(
+                extract_text_from_pdf_textract, max_pages=max_pages, max_chars=max_chars),
+        ),
     )
-    for func in funcs:
-        _text = func(filepath)
-        if len(_text) >= min_len:
-            text = _text
+    funcs = tuple((name, func) for name, func in funcs if name not in _UNAVAILABLE_METHODS)
+    if timeout is not None:
+        texts = _iter_texts_concurrently(
+            source, funcs, timeout, stops={"pdfminer": pdfminer_stop})
+    else:
+        texts = _iter_texts(source, funcs)
+    text = ""
+    score = 0.0
+    for _text in texts:
+        if len(_text) < min_len:
+            continue
+        _score = score_text_quality(_text)
+        if _score > score:
+            text, score = _text, _score
+        if _score >= min_score:
             break
-    return text
+    # cancel any extractions that haven't yet started
+    texts.close()
+    LOGGER.debug("extracted %s chars of text with quality score %.2f", len(text), score)
+    if return_score is True:
+        return (text, score)
+    else:
+        return text
 
 
-def extract_text_from_pdf_tika(filepath):
+def score_text_quality(text):
     """
-    Extract text from a PDF at ``filepath`` using ``tika-python``.
+    Score the quality of résumé ``text`` extracted from a PDF, as a weighted mix of
+    its ratio of alphabetic characters, its average line length, and the number
+    of its lines that match a section header in :obj:`segment.SECTION_HEADERS`.
+    Garbled (e.g. mojibake or "(cid:123)") and one-char-per-line texts score low.
 
     Args:
-        filepath (str)
+        text (str)
 
     Returns:
+        float: Quality score between 0.0 (garbage) and 1.0 (good).
+    """
+    n_chars = 0
+    n_alpha_chars = 0
+    n_lines = 0
+    n_header_lines = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        n_lines += 1
+        n_chars += len(line) - line.count(" ")
+        n_alpha_chars += sum(1 for char in line if char.isalpha())
+        # section headers are short, so don't bother trying to match longer lines
+        if len(line) <= 60 and segment.match_section_header(line) is not None:
+            n_header_lines += 1
+    if n_lines == 0:
+        return 0.0
+    alpha_score = min(n_alpha_chars / n_chars / 0.7, 1.0)
+    line_len_score = min(n_chars / n_lines / 20, 1.0)
+    header_score = min(n_header_lines / 3, 1.0)
+    return 0.4 * alpha_score + 0.3 * line_len_score + 0.3 * header_score
+
+
+def _iter_texts(source, funcs):
+    """
+    Run extraction ``funcs`` on ``source`` one after another, yielding their texts
+    in priority order and skipping any that fail.
+
+    Args:
+        source (str or :class:`pathlib.Path` or bytes)
+        funcs (Sequence[Tuple[str, Callable]])
+
+    Yields:
+        str
+    """
+    for name, func in funcs:
+        try:
+            text = func(source)
+        except ImportError as e:
+            LOGGER.debug("%s text extraction unavailable: %s", name, e)
+            continue
+        except Exception:
+            LOGGER.exception("%s text extraction failed", name)
+            continue
+        yield text
+
+
+def _iter_texts_concurrently(source, funcs, timeout, *, stops=None):
+    """
+    Run all extraction ``funcs`` on ``source`` at once, then yield their texts
+    in priority order, waiting on each only until its own deadline has passed.
+
+    Args:
+        source (str or :class:`pathlib.Path` or bytes)
+        funcs (Sequence[Tuple[str, Callable]])
+        timeout (float or Dict[str, float])
+        stops (Dict[str, :class:`threading.Event`]): Events, keyed by method name,
+            that are set to ask the corresponding funcs to stop early, once they've
+            timed out or the caller has stopped iterating.
+
+    Yields:
         str
+
+    Note:
+        Running threads can't be forcibly stopped, so extractions that are still
+        in progress once the caller stops iterating and that can't be asked to stop
+        are left to finish in the background, and their results are discarded.
     """
-    result = tika_parser.from_file(filepath)
-    return result["content"].strip()
+    stops = stops or {}
+    start_time = time.monotonic()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(funcs))
+    futures = [(name, executor.submit(func, source)) for name, func in funcs]
+    # don't block on any outstanding futures once we're done
+    executor.shutdown(wait=False)
+    try:
+        for name, future in futures:
+            func_timeout = _get_method_timeout(timeout, name)
+            if func_timeout is None:
+                wait_time = None
+            else:
+                wait_time = max(start_time + func_timeout - time.monotonic(), 0.0)
+            try:
+                text = future.result(timeout=wait_time)
+            except concurrent.futures.TimeoutError:
+                LOGGER.warning("%s text extraction timed out after %ss", name, func_timeout)
+                if name in stops:
+                    stops[name].set()
+                continue
+            except ImportError as e:
+                LOGGER.debug("%s text extraction unavailable: %s", name, e)
+                continue
+            except Exception:
+                LOGGER.exception("%s text extraction failed", name)
+                continue
+            yield text
+    finally:
+        for _, future in futures:
+            future.cancel()
+        for stop in stops.values():
+            stop.set()
 
 
-def extract_text_from_pdf_pdfminer(filepath):
+def _get_method_timeout(timeout, name):
     """
-    Extract text from a PDF at ``filepath`` using ``yapdfminer``.
+    Args:
+        timeout (float or Dict[str, float])
+        name (str)
+
+    Returns:
+        float
+    """
+    return timeout.get(name) if isinstance(timeout, dict) else timeout
+
+
+def extract_text_from_pdf_tika(source, *, timeout=None):
+    """
+    Extract text from a PDF ``source`` using ``tika-python``.
 
     Args:
-        filepath (str)
+        source (str or :class:`pathlib.Path` or bytes or file-like)
+        timeout (float): Maximum number of seconds to wait on the tika server's
+            response. If None, tika-python's default is used.
+
+    Returns:
+        str
+    """
+    # hiding the import, since tika (and its deps) are slow to import and not always used
+    from tika import parser as tika_parser
+
+    request_options = {"timeout": timeout} if timeout is not None else {}
+    if isinstance(source, (bytes, bytearray)):
+        result = tika_parser.from_buffer(bytes(source), requestOptions=request_options)
+    elif _is_file_like(source):
+        result = tika_parser.from_buffer(source.read(), requestOptions=request_options)
+    else:
+        result = tika_parser.from_file(str(source), requestOptions=request_options)
+    return (result["content"] or "").strip()
+
+
+def extract_text_from_pdf_pdfminer(source, *, max_pages=None, max_chars=None, stop=None):
+    """
+    Extract text from a PDF ``source`` using ``yapdfminer``.
+
+    Args:
+        source (str or :class:`pathlib.Path` or bytes or file-like)
+        max_pages (int): Maximum number of pages from which to extract text.
+            If None, all pages are processed.
+        max_chars (int): Stop extracting text after the page on which
+            this many characters have been reached. If None, there's no limit.
+        stop (:class:`threading.Event`): If specified, stop extracting text before
+            the next page once this event has been set, e.g. by another thread
+            that's no longer waiting on the result.
 
     Returns:
         str
@@ -68,6 +314,34 @@ def extract_text_from_pdf_pdfminer(filepath):
         It's a fork of pdfminer3, which is a fork of pdfminer.six, which is a fork
         of pdfminer. Other forks also exist. Many are still used, but not many are
         still maintained.
+
+    See Also:
+        :func:`iter_text_from_pdf_pdfminer()`
+    """
+    pages = iter_text_from_pdf_pdfminer(
+        source, max_pages=max_pages, max_chars=max_chars, stop=stop)
+    return "".join(pages).strip()
+
+
+def iter_text_from_pdf_pdfminer(source, *, max_pages=None, max_chars=None, stop=None):
+    """
+    Iterate over the text of a PDF ``source``, page by page, using ``yapdfminer``.
+    Pages are parsed only as they're requested, and nothing is held on to between
+    pages, so callers can stop early without paying for the rest of a long document.
+
+    Args:
+        source (str or :class:`pathlib.Path` or bytes or file-like)
+        max_pages (int): Maximum number of pages from which to extract text.
+            If None, all pages are processed.
+        max_chars (int): Stop extracting text after the page on which
+            this many characters have been reached. If None, there's no limit.
+        stop (:class:`threading.Event`): If specified, stop extracting text before
+            the next page once this event has been set, e.g. by another thread
+            that's no longer waiting on the result.
+
+    Yields:
+        str: Text of the next page, *not* stripped of surrounding whitespace,
+        such that joining all pages' texts gives the text of the full document.
     """
     laparams = pdfminer.layout.LAParams(
         line_overlap=0.5,
@@ -82,30 +356,113 @@ def extract_text_from_pdf_pdfminer(filepath):
     device = pdfminer.converter.TextConverter(
         rsrcmgr, retstr, codec="utf-8", laparams=laparams)
     interpreter = pdfminer.pdfinterp.PDFPageInterpreter(rsrcmgr, device)
-    fp = io.open(filepath, mode="rb")
-    for page in pdfminer.pdfpage.PDFPage.get_pages(fp, set(), maxpages=0, caching=True, check_extractable=True):
-        interpreter.process_page(page)
-    text = retstr.getvalue()
-    fp.close()
-    device.close()
-    retstr.close()
-    return text.strip()
+    n_chars = 0
+    try:
+        with _open_pdf(source) as fp:
+            pages = pdfminer.pdfpage.PDFPage.get_pages(
+                fp, set(), maxpages=max_pages or 0, caching=False, check_extractable=True)
+            for page in pages:
+                if stop is not None and stop.is_set():
+                    LOGGER.debug("stopped extracting text after %s chars", n_chars)
+                    break
+                interpreter.process_page(page)
+                page_text = retstr.getvalue()
+                # reuse the same buffer for every page
+                retstr.seek(0)
+                retstr.truncate(0)
+                yield page_text
+                n_chars += len(page_text)
+                if max_chars is not None and n_chars >= max_chars:
+                    break
+    finally:
+        device.close()
+        retstr.close()
 
 
-def extract_text_from_pdf_textract(filepath):
+def extract_text_from_pdf_textract(source, *, max_pages=None, max_chars=None):
     """
-    Extract text from a PDF at ``filepath`` using ``textract`` + ``pdftotext``.
+    Extract text from a PDF ``source`` using ``textract`` + ``pdftotext``.
 
     Args:
-        filepath (str)
+        source (str or :class:`pathlib.Path` or bytes or file-like)
+        max_pages (int): Maximum number of pages whose text is returned.
+            If None, all pages' text is returned.
+        max_chars (int): Truncate text after the page on which
+            this many characters have been reached. If None, there's no limit.
 
     Returns:
         str
+
+    Note:
+        ``textract`` only works on files on disk, so in-memory sources are written
+        to a temporary file first. It also has no way to limit the pages that
+        ``pdftotext`` processes, so ``max_pages`` and ``max_chars`` are applied
+        to its output, split at the form feeds with which ``pdftotext`` ends pages.
     """
     # hiding the import so folks don't have to worry about installing it
     # https://textract.readthedocs.io/en/stable/installation.html
     import textract
 
-    return textract.process(
-        filepath, method="pdftotext", encoding="utf-8"
-    ).decode("utf-8").strip()
+    if isinstance(source, (str, os.PathLike)):
+        text = textract.process(
+            str(source), method="pdftotext", encoding="utf-8"
+        ).decode("utf-8")
+        return _truncate_pages(text, max_pages=max_pages, max_chars=max_chars).strip()
+    with _open_pdf(source) as fp, tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+        tmp.write(fp.read())
+        tmp.flush()
+        return extract_text_from_pdf_textract(
+            tmp.name, max_pages=max_pages, max_chars=max_chars)
+
+
+def _truncate_pages(text, *, max_pages=None, max_chars=None):
+    """
+    Truncate ``text`` whose pages end in form feeds to at most ``max_pages`` pages,
+    stopping after the page on which ``max_chars`` characters have been reached,
+    same as :func:`iter_text_from_pdf_pdfminer()`.
+
+    Args:
+        text (str)
+        max_pages (int)
+        max_chars (int)
+
+    Returns:
+        str
+    """
+    if max_pages is None and max_chars is None:
+        return text
+    pages = []
+    n_chars = 0
+    for page in text.split("\f"):
+        if max_pages is not None and len(pages) >= max_pages:
+            break
+        pages.append(page)
+        n_chars += len(page) + 1
+        if max_chars is not None and n_chars >= max_chars:
+            break
+    return "\f".join(pages)
+
+
+def _is_file_like(source):
+    return hasattr(source, "read")
+
+
+@contextlib.contextmanager
+def _open_pdf(source):
+    """
+    Open a PDF ``source`` as a binary file-like object, closing it when done
+    only if it was opened here.
+
+    Args:
+        source (str or :class:`pathlib.Path` or bytes or file-like)
+
+    Yields:
+        file-like
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield io.BytesIO(source)
+    elif _is_file_like(source):
+        yield source
+    else:
+        with io.open(source, mode="rb") as f:
+            yield f
@@ -12,6 +12,7 @@ import random as rnd
 import re
 
 import faker
+from toolz import itertoolz
 
 from msvdd_bloc import regexes, tokenize, utils
 from msvdd_bloc.resumes import constants as c
@@ -184,7 +185,9 @@ class MarkovModel:
         return "".join(chars)
 
 
-def generate_labeled_tokens(templates, fields, *, n=1, fixed_val_field_keys=None):
+def generate_labeled_tokens(
+    templates, fields, *, n=1, fixed_val_field_keys=None, batch_size=100,
+):
     """
     Generate one or many fake examples by combining fields arranged as in ``templates``
     with values and default labels specified by ``fields``.
@@ -195,11 +198,30 @@ def generate_labeled_tokens(templates, fields, *, n=1, fixed_val_field_keys=None
         section (str)
         n (int)
         fixed_val_field_keys (str or Set[str])
+        batch_size (int): Number of examples whose field values are tokenized
+            together, in one batched pass.
 
     Yields:
         List[Tuple[str, str]]
     """
     fixed_val_field_keys = utils.to_collection(fixed_val_field_keys, str, set)
+    examples = _generate_field_vals_labels(templates, fields, n, fixed_val_field_keys)
+    for batch in itertoolz.partition_all(batch_size, examples):
+        vals_tokens = tokenize.tokenize_many(
+            (val for field_vals, _ in batch for val in field_vals), batch_size=1000,
+        )
+        for field_vals, field_labels in batch:
+            tok_labels = []
+            for label in field_labels:
+                tok_labels.extend((tok.text, label) for tok in next(vals_tokens))
+            yield tok_labels
+
+
+def _generate_field_vals_labels(templates, fields, n, fixed_val_field_keys):
+    """
+    Yields:
+        Tuple[List[str], List[str]]: Next example's field values and their labels.
+    """
     for template in rnd.choices(templates, k=n):
         if callable(template):
             template = template()
@@ -222,9 +244,4 @@ def generate_labeled_tokens(templates, fields, *, n=1, fixed_val_field_keys=None
             field_keys.append(field_key)
             field_labels.append(field_label)
             field_vals.append(field_value)
-        tok_labels = [
-            (tok.text, label)
-            for val, label in zip(field_vals, field_labels)
-            for tok in tokenize.tokenize(val)
-        ]
-        yield tok_labels
+        yield (field_vals, field_labels)
@@ -5,6 +5,7 @@ munge
 Munge résumé text data: clean and normalize the text itself,
 and split it into content-bearing lines on a configurable delimiter.
 """
+import itertools
 import re
 import unicodedata
 
@@ -14,6 +15,23 @@ from toolz import itertoolz
 from .. import regexes
 
 
+# anything other than printable ascii chars, or what might be an html entity
+_RE_FIX_CHARS = re.compile(r"[^\t\n\x0c\x20-\x7e]|&#?[0-9A-Za-z_]*;")
+_MAX_FIX_LINES_LEN = 1000000
+# NOTE: replacing plain spaces with themselves is a no-op, so they're left out here
+_RE_NORMALIZE_CHARS = re.compile(
+    r"(?P<bullet>{})|(?P<zero_width_space>\u200b)|(?P<line_break>\v)|(?P<space>[^\S\n\v ])".format(
+        regexes.RE_BULLETS.pattern),
+    flags=re.UNICODE,
+)
+_NORMALIZE_CHAR_REPLACEMENTS = {
+    "bullet": "-",
+    "zero_width_space": "",
+    "line_break": "\n",
+    "space": " ",
+}
+
+
 def normalize_text(text):
     """
     Correct any encoding / mojibake / unicode weirdness, standardize list bullets, etc.
@@ -24,20 +42,51 @@ def normalize_text(text):
     Returns:
         str
     """
-    norm_text = text
     # normalize unicode and fix encoding/mojibake
-    norm_text = ftfy.fix_text(norm_text)
-    norm_text = unicodedata.normalize("NFC", norm_text)
-    # standardize bullets
-    norm_text = regexes.RE_BULLETS.sub("-", norm_text)
-    # normalize whitespace
-    norm_text = norm_text.replace("\u200b", "")
-    norm_text = regexes.RE_NONBREAKING_SPACE.sub(" ", norm_text).strip()
+    norm_text = _fix_text(text)
+    # standardize bullets and normalize whitespace, all in one pass
+    norm_text = _RE_NORMALIZE_CHARS.sub(_replace_normalize_char, norm_text).strip()
     norm_text = regexes.RE_MANY_SPACES.sub("    ", norm_text)
-    norm_text = regexes.RE_BREAKING_SPACE.sub(r"\n", norm_text)
     return norm_text
 
 
+def _fix_text(text):
+    """
+    Fix encoding / mojibake / unicode weirdness in ``text`` via :func:`ftfy.fix_text()`
+    plus NFC normalization, skipping lines of plain, printable ASCII text
+    that neither could possibly change.
+
+    Args:
+        text (str)
+
+    Returns:
+        str
+
+    Note:
+        ``ftfy`` fixes text in independent segments split on newlines, so skipping
+        lines is equivalent to fixing the full text -- except when the text contains
+        a "<", which changes how ``ftfy`` handles HTML entities in subsequent segments,
+        or is so long that ``ftfy`` splits its segments differently.
+    """
+    if _RE_FIX_CHARS.search(text) is None:
+        return text
+    elif "<" in text or len(text) > _MAX_FIX_LINES_LEN:
+        return unicodedata.normalize("NFC", ftfy.fix_text(text))
+    lines = text.split("\n")
+    lines = [line + "\n" for line in lines[:-1]] + lines[-1:]
+    segments = []
+    for needs_fix, seg_lines in itertools.groupby(
+        lines, key=lambda line: _RE_FIX_CHARS.search(line) is not None,
+    ):
+        segment = "".join(seg_lines)
+        segments.append(ftfy.fix_text(segment) if needs_fix else segment)
+    return unicodedata.normalize("NFC", "".join(segments))
+
+
+def _replace_normalize_char(match):
+    return _NORMALIZE_CHAR_REPLACEMENTS[match.lastgroup]
+
+
 def get_filtered_text_lines(text, *, delim=r" ?\n"):
     """
     Split ``text`` into lines, filtering out some superfluous lines if context allows.
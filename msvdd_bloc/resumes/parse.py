@@ -2,76 +2,265 @@
 parse
 -----
 """
+import functools
+import gc
 import logging
 
 import marshmallow as ma
 
-from msvdd_bloc import schemas
-from msvdd_bloc.resumes import munge, segment
+from msvdd_bloc import schemas, tokenize, utils
+from msvdd_bloc.resumes import munge, parse_utils, segment
 from msvdd_bloc.resumes import basics, education, skills, work
 
 
 LOGGER = logging.getLogger(__name__)
+
+PIPELINE_VERSION = 3
+"""
+int: Version of the résumé text extraction and parsing pipeline, which must be bumped
+whenever a change to extraction, normalization, segmentation, featurization,
+or post-processing could change parsed results, since it's part of the keys
+under which results are cached by :class:`cache.ParseCache()`.
+"""
+
 _RESUME_SCHEMA = schemas.ResumeSchema()
+_load_resume_data = schemas.compile_loader(_RESUME_SCHEMA)
+_VALIDATE_MODES = ("full", "fast", "off")
+_SECTION_MODULES = {
+    "basics": basics,
+    "education": education,
+    "skills": skills,
+    "work": work,
+}
+_WARM_UP_TEXT = """
+Jane Doe
+jane.doe@example.com  |  555-555-5555
+
+EXPERIENCE
+Some Company, Senior Job Title
+New York, NY    Jan 2018 – Mar 2019
+● Did some things at Some Company
+
+EDUCATION
+University of Some Place
+B.A. in Computer Science    Sep 2012 - June 2016
+
+SKILLS
+● Languages: HTML, CSS, JavaScript, Python
+"""
 
 
-def parse_text(text):
+def parse_text(text, *, stats=None, validate="full"):
     """
     Parse raw extracted résumé ``text`` into structured data conforming to the schema
     specified in :class:`schemas.ResumeSchema()`.
 
     Args:
         text (str)
+        stats (:class:`parse_utils.ParseStats`): If specified, record wall times
+            and counts for each stage of parsing, including per-section tokenization,
+            featurization, and tagging, in this object.
+        validate (str): How to validate parsed data against the schema, dropping
+            any invalid values. If "full", load it with the marshmallow schema itself;
+            if "fast", use an equivalent validator compiled from the schema via
+            :func:`schemas.compile_loader()`, which gives the same results in less time;
+            if "off", skip validation and return the parsed data as-is,
+            e.g. when validating many parsed résumés downstream.
 
     Returns:
         Dict[str, object]
     """
-    data = {}
+    _check_validate(validate)
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+    sections_lines = _get_sections_lines(text, stats)
+    if sections_lines is None:
+        return {}
+    # tokenize all sections in one go, rather than section by section
+    with stats.timer("tokenize"):
+        sections_tokens = tokenize.tokenize_sections(_get_sections_texts(sections_lines))
+    return _parse_sections_tokens(sections_lines, sections_tokens, stats, validate)
+
+
+def _check_validate(validate):
+    if validate not in _VALIDATE_MODES:
+        raise ValueError(
+            "validate={} is invalid; valid values are {}".format(validate, _VALIDATE_MODES)
+        )
+
 
-    norm_text = munge.normalize_text(text)
-    text_lines = munge.get_filtered_text_lines(norm_text)
-    section_lines = segment.get_section_lines(text_lines)
+def _get_sections_lines(text, stats):
+    """
+    Normalize and segment ``text`` into the lines belonging to each section
+    that gets parsed, or None if it couldn't be segmented into sections.
+
+    Args:
+        text (str)
+        stats (:class:`parse_utils.ParseStats`)
+
+    Returns:
+        Dict[str, List[str]] or None
+    """
+    with stats.timer("normalize"):
+        norm_text = munge.normalize_text(text)
+    with stats.timer("filter_lines"):
+        text_lines = munge.get_filtered_text_lines(norm_text)
+    with stats.timer("segment"):
+        section_lines = segment.get_section_lines(text_lines)
+    stats.count("n_chars", len(text))
+    stats.count("n_lines", len(text_lines))
 
     # if we don't get any sections besides the default, something's gone wrong
     if set(section_lines.keys()) == {"start"}:
         LOGGER.warning("unable to parse résumé text\n%s ...", text[:500])
-        return data
+        return None
 
-    # basics section
-    basics_lines = section_lines.get("start", []) + section_lines.get("basics", [])
-    basics_data = basics.parse.parse_lines(basics_lines)
     # NOTE: uncomment if summary section is split out from main basics lines
-    # if section_lines.get("summary"):
-    #     basics_data["summary"] = "\n".join(section_lines["summary"]).strip()
-    data["basics"] = basics_data
-
-    # education
-    education_lines = section_lines.get("education", [])
-    education_data = education.parse.parse_lines(education_lines)
-    data["education"] = education_data
+    # summary_lines = section_lines.get("summary", [])
     # NOTE: uncomment if courses subsection is split out from main education lines
     # courses_lines = section_lines.get("courses", [])
+    return {
+        "basics": section_lines.get("start", []) + section_lines.get("basics", []),
+        "education": section_lines.get("education", []),
+        "skills": section_lines.get("skills", []),
+        "work": section_lines.get("work", []),
+    }
+
+
+def _get_sections_texts(sections_lines):
+    """
+    Args:
+        sections_lines (Dict[str, List[str]])
+
+    Returns:
+        List[str]
+    """
+    return ["\n".join(lines).strip() for lines in sections_lines.values()]
+
+
+def _parse_sections_tokens(sections_lines, sections_tokens, stats, validate):
+    """
+    Parse each section's tokens into structured data, then validate it all together.
+
+    Args:
+        sections_lines (Dict[str, List[str]])
+        sections_tokens (List[List[:class:`spacy.tokens.Token`]])
+        stats (:class:`parse_utils.ParseStats`)
+        validate (str)
 
-    # skills
-    skills_lines = section_lines.get("skills", [])
-    skills_data = skills.parse.parse_lines(skills_lines)
-    data["skills"] = skills_data
-
-    # work
-    work_lines = section_lines.get("work", [])
-    work_data = work.parse.parse_lines(work_lines)
-    data["work"] = work_data
-
-    # TODO: figure out what we want to do here
-    # option 1: validate and warn, but return data as-is
-    # validation = _RESUME_SCHEMA.validate(data)
-    # if validation:
-    #     LOGGER.warning("validation error: %s", validation)
-    # option 2: validate and warn, but only return valid data
-    try:
-        data = _RESUME_SCHEMA.load(data)
-    except ma.ValidationError as e:
-        LOGGER.warning("validation error: %s", e.messages)
-        data = e.valid_data
+    Returns:
+        Dict[str, object]
+    """
+    data = {}
+    for (section, lines), tokens in zip(sections_lines.items(), sections_tokens):
+        stats.count(section + ".n_lines", len(lines))
+        data[section] = _SECTION_MODULES[section].parse.parse_tokens(tokens, stats=stats)
+
+    # validate and warn, but only return valid data
+    if validate == "full":
+        with stats.timer("validate"):
+            try:
+                data = _RESUME_SCHEMA.load(data)
+            except ma.ValidationError as e:
+                LOGGER.warning("validation error: %s", e.messages)
+                data = e.valid_data
+    elif validate == "fast":
+        with stats.timer("validate"):
+            data, errors = _load_resume_data(data)
+            if errors:
+                LOGGER.warning("validation error: %s", errors)
 
     return data
+
+
+def parse_texts(texts, *, n_process=1, chunk_size=25, validate="full"):
+    """
+    Parse a stream of raw extracted résumé ``texts`` into structured data conforming
+    to the schema specified in :class:`schemas.ResumeSchema()`, optionally spreading
+    the work across multiple processes.
+
+    Args:
+        texts (Iterable[str])
+        n_process (int): Number of worker processes to use. If 1, texts are parsed
+            in the current process; if -1, use as many processes as there are CPUs.
+            Each worker loads the tokenizer and section taggers just once.
+        chunk_size (int): Number of texts sent to a worker process at a time.
+        validate (str): How to validate parsed data against the schema;
+            see :func:`parse_text()` for details.
+
+    Yields:
+        Dict[str, object]: Next parsed résumé, in the same order as ``texts``.
+
+    See Also:
+        :func:`parse_text()`
+    """
+    _check_validate(validate)
+    yield from utils.map_chunks(
+        functools.partial(_parse_texts_chunk, validate=validate),
+        texts,
+        chunk_size=chunk_size,
+        n_process=n_process,
+        initializer=load_taggers,
+    )
+
+
+def _parse_texts_chunk(texts, *, validate):
+    """
+    Args:
+        texts (List[str])
+        validate (str)
+
+    Returns:
+        List[Dict[str, object]]
+    """
+    stats = parse_utils.NULL_STATS
+    texts_sections_lines = [_get_sections_lines(text, stats) for text in texts]
+    # tokenize all résumés' sections in one streamed, batched pass
+    texts_sections_tokens = tokenize.tokenize_sections_many(
+        _get_sections_texts(sections_lines)
+        for sections_lines in texts_sections_lines
+        if sections_lines is not None
+    )
+    results = []
+    for sections_lines in texts_sections_lines:
+        if sections_lines is None:
+            results.append({})
+        else:
+            sections_tokens = next(texts_sections_tokens)
+            results.append(
+                _parse_sections_tokens(sections_lines, sections_tokens, stats, validate)
+            )
+    return results
+
+
+def load_taggers():
+    """
+    Load the trained CRF taggers for all résumé sections into memory,
+    so that the first call to :func:`parse_text()` doesn't pay the cost.
+    """
+    for module in (basics, education, skills, work):
+        parse_utils.load_tagger(module.FPATH_TAGGER)
+
+
+def warm_up(*, freeze=True):
+    """
+    Load everything needed to parse résumés — the tokenizer, text fixers, schemas,
+    and trained CRF taggers for all sections — and exercise it all by parsing
+    a dummy résumé, so that the first "real" call to :func:`parse_text()`
+    runs at steady-state speed.
+
+    This is meant to be called in a parent process before it forks workers,
+    e.g. a gunicorn master with ``preload_app`` enabled, so that the workers share
+    the loaded models' memory copy-on-write rather than each loading their own.
+
+    Args:
+        freeze (bool): If True, move all objects tracked by the garbage collector
+            into a permanent generation, so that collections in forked processes
+            don't touch (and thereby copy) the memory pages in which they live.
+    """
+    load_taggers()
+    parse_text(_WARM_UP_TEXT)
+    if freeze is True:
+        gc.collect()
+        gc.freeze()
+        LOGGER.info("froze %s objects for sharing with forked processes", gc.get_freeze_count())
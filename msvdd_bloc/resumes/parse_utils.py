@@ -6,11 +6,16 @@ Functionality for tokenizing, featurizing, tagging, padding sequences, and loadi
 in a résumé section-agnostic manner. Section subpackages use and build upon these utils
 in their respective ``parse.py`` modules.
 """
-import functools
+import collections
+import contextlib
 import importlib
+import io
 import logging
+import os
 import string
 import sys
+import threading
+import time
 
 import pycrfsuite
 from toolz import itertoolz
@@ -18,11 +23,108 @@ from toolz import itertoolz
 
 LOGGER = logging.getLogger(__name__)
 _PUNCT_CHARS = set(string.punctuation)
+_NEIGHBOR_OFFSETS = (("ppprev", -3), ("pprev", -2), ("prev", -1), ("next", 1), ("nnext", 2))
+_THREAD_LOCAL = threading.local()
+_TAGGER_MODELS = {}
+_TAGGER_MODELS_LOCK = threading.Lock()
+
+
+class ParseStats:
+    """
+    Record the cumulative wall time spent in and counts of items processed by
+    each stage of résumé parsing, for profiling purposes.
+
+    Example::
+
+        >>> stats = ParseStats()
+        >>> data = parse_text(text, stats=stats)
+        >>> stats.to_dict()
+        {'timings': {'normalize': 0.0021, 'segment': 0.0004, 'tokenize': 0.0031, ...},
+         'counts': {'n_chars': 2648, 'n_lines': 61, 'basics.n_tokens': 87, ...}}
+
+    Note:
+        If stats aren't needed, use :obj:`NULL_STATS` instead, which records nothing
+        and costs (almost) nothing.
+    """
+
+    def __init__(self):
+        self.timings = collections.defaultdict(float)
+        self.counts = collections.defaultdict(int)
+
+    @contextlib.contextmanager
+    def timer(self, stage):
+        """
+        Add the wall time spent in this context manager's block to ``stage``.
+
+        Args:
+            stage (str)
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] += time.perf_counter() - start_time
+
+    def count(self, name, n=1):
+        """
+        Add ``n`` to the count for ``name``.
+
+        Args:
+            name (str)
+            n (int)
+        """
+        self.counts[name] += n
+
+    def to_dict(self):
+        """
+        Returns:
+            Dict[str, Dict[str, float or int]]
+        """
+        return {"timings": dict(self.timings), "counts": dict(self.counts)}
+
+
+class _NullTimer:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _NullParseStats(ParseStats):
+    """Stand-in for :class:`ParseStats` that records nothing."""
+
+    _timer = _NullTimer()
+
+    def __init__(self):
+        pass
+
+    def timer(self, stage):
+        return self._timer
+
+    def count(self, name, n=1):
+        pass
+
+    def to_dict(self):
+        return {"timings": {}, "counts": {}}
+
+
+NULL_STATS = _NullParseStats()
+"""
+:class:`ParseStats`: Shared, no-op stats object used when stats aren't requested.
+"""
 
 
-@functools.lru_cache(maxsize=16)
 def load_tagger(fpath):
     """
+    Load the trained CRF tagger saved at ``fpath``, once per thread. CRFsuite taggers
+    keep per-instance decoding state, so they mustn't be shared across threads;
+    however, the model file is only read once per process, and all threads'
+    taggers use the same in-memory copy of it. If the file changes on disk,
+    e.g. because the model was retrained, it's read again, and each thread's tagger
+    is re-opened from the new model the next time it's loaded.
+
     Args:
         fpath (str or :class:`pathlib.Path`)
 
@@ -30,16 +132,58 @@ def load_tagger(fpath):
         :class:`pycrfsuite.Tagger`
     """
     try:
+        taggers = _THREAD_LOCAL.taggers
+    except AttributeError:
+        taggers = _THREAD_LOCAL.taggers = {}
+    fpath = str(fpath)
+    model = _load_tagger_model(fpath)
+    model_tagger = taggers.get(fpath)
+    if model_tagger is None or model_tagger[0] is not model:
         tagger = pycrfsuite.Tagger()
-        tagger.open(str(fpath))
-        return tagger
-    except IOError:
-        LOGGER.warning(
-            "tagger model file '%s' is missing; have you trained one yet? "
-            "if not, use the `label_parser_training_data.py` script to do so.",
-            fpath,
-        )
-        raise
+        tagger.open_inmemory(model)
+        # taggers don't hold a reference to the model they're opened from,
+        # so keep one here, lest it be freed out from under them
+        model_tagger = taggers[fpath] = (model, tagger)
+    return model_tagger[1]
+
+
+def _load_tagger_model(fpath):
+    """
+    Args:
+        fpath (str)
+
+    Returns:
+        bytes
+
+    Note:
+        Models are keyed by their files' sizes and modification times, which are
+        checked on every call, so retrained models are picked up without a restart.
+        If a model's file goes missing after it's been read, its last-read version
+        is used.
+    """
+    try:
+        stat = os.stat(fpath)
+        file_version = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        file_version = None
+    with _TAGGER_MODELS_LOCK:
+        loaded = _TAGGER_MODELS.get(fpath)
+        if loaded is not None and (file_version is None or loaded[0] == file_version):
+            return loaded[1]
+        try:
+            with io.open(fpath, mode="rb") as f:
+                model = f.read()
+        except IOError:
+            LOGGER.warning(
+                "tagger model file '%s' is missing; have you trained one yet? "
+                "if not, use the `label_parser_training_data.py` script to do so.",
+                fpath,
+            )
+            raise
+        if loaded is not None:
+            LOGGER.info("tagger model file '%s' has changed; reloading it", fpath)
+        _TAGGER_MODELS[fpath] = (file_version, model)
+    return model
 
 
 def get_token_features_base(token):
@@ -54,6 +198,7 @@ def get_token_features_base(token):
         Dict[str, obj]
     """
     text = token.text
+    chars = set(text)
     return {
         "idx": token.i,
         "len": len(token),
@@ -76,9 +221,9 @@ def get_token_features_base(token):
         "like_email": token.like_email,
         "is_stop": token.is_stop,
         "is_alnum": text.isalnum(),
-        "is_newline": all(char == "\n" for char in text),
-        "is_partial_digit": any(c.isdigit() for c in text) and not all(c.isdigit() for c in text),
-        "is_partial_punct": any(c in _PUNCT_CHARS for c in text) and not all(c in _PUNCT_CHARS for c in text),
+        "is_newline": not text.strip("\n"),
+        "is_partial_digit": not text.isdigit() and any(map(str.isdigit, text)),
+        "is_partial_punct": not chars.isdisjoint(_PUNCT_CHARS) and not chars <= _PUNCT_CHARS,
     }
 
 
@@ -102,6 +247,142 @@ def pad_tokens_features(tokens_features, *, n_left=1, n_right=1):
     )
 
 
+def flatten_features(features):
+    """
+    Flatten a (possibly nested) dict of ``features`` into CRFsuite attributes
+    exactly as ``pycrfsuite`` does internally, but dropping zero-valued attributes,
+    which don't contribute anything to a trained tagger's predictions.
+
+    Args:
+        features (Dict[str, obj])
+
+    Returns:
+        Dict[str, float]: Mapping of attribute name to its (non-zero) weight.
+
+    See Also:
+        :func:`add_feature()`
+    """
+    attrs = {}
+    for key, value in features.items():
+        add_feature(attrs, key, value)
+    return attrs
+
+
+def add_feature(attrs, key, value):
+    """
+    Add a feature given by ``key`` and ``value`` to ``attrs`` as CRFsuite attribute(s),
+    modifying it in-place: str values become a "key:value" attribute with weight 1.0;
+    dict values are flattened recursively, with "key:" prefixed to their attributes;
+    bool and numeric values become a "key" attribute with the value as its weight,
+    unless they're zero-valued, in which case they're skipped.
+
+    Args:
+        attrs (Dict[str, float])
+        key (str)
+        value (str or bool or int or float or Dict[str, obj])
+    """
+    if isinstance(value, str):
+        attrs[key + ":" + value] = 1.0
+    elif isinstance(value, dict):
+        for nested_key, nested_value in value.items():
+            add_feature(attrs, key + ":" + nested_key, nested_value)
+    elif value:
+        attrs[key] = float(value)
+
+
+def get_lexical_features(tokens, get_token_features, *, cache):
+    """
+    Get per-token features that depend only on each token's text, looking them up
+    by text in ``cache`` and only computing (then caching) them for unseen texts,
+    so that frequently repeated tokens — newlines, punctuation, years, common words —
+    are featurized just once per process.
+
+    Args:
+        tokens (List[:class:`spacy.tokens.Token`])
+        get_token_features (Callable): Section-specific function that gets
+            a token's features, e.g. :func:`work.parse.get_token_features()`.
+        cache (:class:`msvdd_bloc.utils.LRUCache`): Section-specific cache,
+            which mustn't be shared with other ``get_token_features`` functions.
+
+    Returns:
+        List[Tuple[Dict[str, obj], Dict[str, float], Tuple[Dict[str, float]]]]:
+        For each token, its features *excluding* its position-dependent "idx";
+        those features flattened into CRFsuite attributes, as by :func:`flatten_features()`;
+        and those attributes prefixed by each neighbor name, in the order given by
+        ``_NEIGHBOR_OFFSETS``, for use in nearby tokens' items.
+
+    Note:
+        Cached values are shared across all occurrences of the same text,
+        so they must be treated as read-only.
+    """
+    tokens_lex_features = []
+    for token in tokens:
+        lex_features = cache.get(token.text)
+        if lex_features is None:
+            features = get_token_features(token)
+            del features["idx"]
+            attrs = flatten_features(features)
+            neighbors_attrs = tuple(
+                {sys.intern(name + ":" + key): value for key, value in attrs.items()}
+                for name, _ in _NEIGHBOR_OFFSETS
+            )
+            lex_features = (features, attrs, neighbors_attrs)
+            cache.set(token.text, lex_features)
+        tokens_lex_features.append(lex_features)
+    return tokens_lex_features
+
+
+def get_feature_items(tokens_lex_features, tokens_seq_features=None):
+    """
+    Get CRFsuite items for a sequence of tokens from their per-token features
+    plus those of their neighboring tokens (three before, two after),
+    and, optionally, additional features that depend on their position in the sequence.
+
+    Args:
+        tokens_lex_features (List[Tuple[Dict[str, obj], Dict[str, float], Tuple[Dict[str, float]]]]):
+            Per-token lexical features, as produced by :func:`get_lexical_features()`.
+            Each token's "idx" feature is taken to be its position in this sequence.
+        tokens_seq_features (List[Dict[str, obj]]): Additional per-token features
+            that depend on the sequence, e.g. a token's index within its line;
+            these aren't added to neighboring tokens' items. If only one token is given,
+            it's flagged as a "singleton" and these features are ignored.
+
+    Returns:
+        :class:`pycrfsuite.ItemSequence`
+
+    Note:
+        Items are identical to those produced by ``pycrfsuite`` from nested dicts,
+        i.e. ``{**tf, "ppprev": ppprev_tf, ..., "nnext": nnext_tf, **seq_tf}``,
+        with neighbors beyond the sequence's edges padded by ``{"_start": True}``
+        or ``{"_end": True}`` dicts, but without any zero-valued attributes.
+    """
+    n_tokens = len(tokens_lex_features)
+    if n_tokens == 1:
+        item = tokens_lex_features[0][1].copy()
+        item["_singleton"] = 1.0
+        return pycrfsuite.ItemSequence([item])
+    items = []
+    for idx, (_, attrs, _) in enumerate(tokens_lex_features):
+        # "idx" comes first, to match the order of features in the nested dicts
+        item = {"idx": float(idx)} if idx else {}
+        item.update(attrs)
+        for nbr, (name, offset) in enumerate(_NEIGHBOR_OFFSETS):
+            nbr_idx = idx + offset
+            if nbr_idx < 0:
+                item[name + ":_start"] = 1.0
+            elif nbr_idx >= n_tokens:
+                item[name + ":_end"] = 1.0
+            else:
+                if nbr_idx:
+                    item[name + ":idx"] = float(nbr_idx)
+                item.update(tokens_lex_features[nbr_idx][2][nbr])
+        if tokens_seq_features is not None:
+            for key, value in tokens_seq_features[idx].items():
+                add_feature(item, key, value)
+        items.append(item)
+    return pycrfsuite.ItemSequence(items)
+
+
 def get_line_token_idxs(tokens_features):
     """
     Get the [start, stop) indexes for all lines in ``tokens_features``,
@@ -110,12 +391,12 @@ def get_line_token_idxs(tokens_features):
 
     Args:
         tokens_features (List[Dict[str, obj]]: Sequence of featurized tokens, as produced
-            by :func:`get_token_features_base()`.
+            by :func:`get_token_features_base()`, optionally without their "idx".
 
     Yields:
         Tuple[int, int]
     """
-    idxs_newlines = [tf["idx"] for tf in tokens_features if tf["is_newline"]]
+    idxs_newlines = [idx for idx, tf in enumerate(tokens_features) if tf["is_newline"]]
     if not idxs_newlines:
         yield (0, len(tokens_features))
     else:
@@ -127,13 +408,52 @@ def get_line_token_idxs(tokens_features):
             yield (idx1, idx2)
 
 
+def get_line_years(tokens_features, line_tok_idxs):
+    """
+    Get the maximum year among year-like tokens in a line, the number of times
+    that it occurs, and the total number of year-like tokens, so that each token
+    can be compared against all other years in its line without rescanning it.
+
+    Args:
+        tokens_features (List[Dict[str, obj]]): Sequence of featurized tokens,
+            including a "like_year" feature.
+        line_tok_idxs (range): Indexes in ``tokens_features`` of the line's tokens,
+            as produced by :func:`get_line_token_idxs()`.
+
+    Returns:
+        Tuple[int, int, int]: Max year (or None, if no years), count of max year,
+        and count of all years in the line.
+    """
+    years = [
+        get_token_year(tokens_features[idx])
+        for idx in line_tok_idxs
+        if tokens_features[idx]["like_year"] is True
+    ]
+    if not years:
+        return (None, 0, 0)
+    max_year = max(years)
+    return (max_year, years.count(max_year), len(years))
+
+
+def get_token_year(token_features):
+    """
+    Args:
+        token_features (Dict[str, obj]): Features of a year-like token.
+
+    Returns:
+        int
+    """
+    return int(token_features["prefix"] + token_features["suffix"])
+
+
 def tag(tokens, features, *, tagger):
     """
     Tag each token in ``tokens`` with a section-specific label based on its features.
 
     Args:
         tokens (List[:class:`spacy.tokens.Token`]): A tokenized line of text.
-        features (List[Dict[str, obj]]): As output by a section-specific ``featurize()``.
+        features (:class:`pycrfsuite.ItemSequence`): As output by
+            a section-specific ``featurize()``.
         tagger (:class:`pycrfsuite.Tagger`): Trained, section-specific CRF tagger.
 
     Returns:
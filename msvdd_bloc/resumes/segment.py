@@ -143,6 +143,64 @@ that matches header lines indicating the start of the corresponding section.
 """
 
 
+def _combine_section_headers(section_headers):
+    """
+    Combine per-section header patterns into a single pattern that tries them
+    in the same (priority) order, so that only one scan per line is needed.
+    Each section's alternative is captured in a group named for that section,
+    and its "end" group is renamed to "<section>_end".
+
+    Args:
+        section_headers (Dict[str, :class:`re.Pattern`])
+
+    Returns:
+        :class:`re.Pattern`
+    """
+    alternatives = []
+    for section, pattern in section_headers.items():
+        alternative = (
+            pattern.pattern.lstrip("^")
+            .replace("(?P<text>", "(?:")
+            .replace("(?P<end>", "(?P<{}_end>".format(section))
+        )
+        alternatives.append("(?P<{}>{})".format(section, alternative))
+    return re.compile(r"^(?:" + "|".join(alternatives) + ")", flags=re.IGNORECASE)
+
+
+RE_SECTION_HEADER = _combine_section_headers(SECTION_HEADERS)
+"""
+:class:`re.Pattern`: All patterns in :obj:`SECTION_HEADERS` combined into one,
+such that the name of the first section whose header matches is given by
+``match.lastgroup``.
+"""
+
+# all section headers are short and start with a letter, so lines that don't
+# (and that don't have inline content following a ": ") can be skipped outright
+_MAX_HEADER_LEN = 60
+
+
+def match_section_header(line):
+    """
+    Match ``line`` against all section headers in :obj:`SECTION_HEADERS`,
+    in priority order, and in a single pass.
+
+    Args:
+        line (str)
+
+    Returns:
+        Tuple[str, :class:`re.Match`] or None: Name of the first section whose
+        header matches ``line`` plus the corresponding match, whose "<section>_end"
+        group is equivalent to the per-section patterns' "end" group;
+        or None if no section header matches.
+    """
+    if not line[:1].isalpha() or (len(line) > _MAX_HEADER_LEN and ": " not in line):
+        return None
+    match = RE_SECTION_HEADER.match(line)
+    if match is None:
+        return None
+    return (match.lastgroup, match)
+
+
 def get_section_lines(lines, keep_subheaders=True):
     """
     Parse a sequence of text lines from a résumé into a mapping of section name
@@ -162,23 +220,22 @@ def get_section_lines(lines, keep_subheaders=True):
     prev_section = None
     curr_section = "start"
     for line in lines:
-        for section, pattern in SECTION_HEADERS.items():
-            match = pattern.match(line)
-            if match:
-                prev_section, curr_section = curr_section, section
-                # if header is a "sub-header", don't skip its text content
-                if keep_subheaders is True and prev_section == curr_section:
-                    section_lines[curr_section].append(line)
-                # if header is the start of a line with more content
-                # append only the post-header content
-                elif match.group("end").endswith(": "):
-                    section_lines[curr_section].append(line[match.end():])
-                # if header is a whole line on its own, skip to the next line
-                else:
-                    pass
-                # only one section header match permitted per line
-                break
+        # only one section header match permitted per line
+        header = match_section_header(line)
         # no new match, so add line to current section
-        else:
+        if header is None:
+            section_lines[curr_section].append(line)
+            continue
+        section, match = header
+        prev_section, curr_section = curr_section, section
+        # if header is a "sub-header", don't skip its text content
+        if keep_subheaders is True and prev_section == curr_section:
             section_lines[curr_section].append(line)
+        # if header is the start of a line with more content
+        # append only the post-header content
+        elif match.group(section + "_end").endswith(": "):
+            section_lines[curr_section].append(line[match.end():])
+        # if header is a whole line on its own, skip to the next line
+        else:
+            pass
     return dict(section_lines)
@@ -3,15 +3,14 @@ import logging
 import operator
 import re
 
-from toolz import itertoolz
-
-from msvdd_bloc import tokenize
+from msvdd_bloc import tokenize, utils
 from msvdd_bloc.resumes import constants
 from msvdd_bloc.resumes import parse_utils
 from msvdd_bloc.resumes import skills
 
 
 LOGGER = logging.getLogger(__name__)
+_LEXICAL_FEATURES_CACHE = utils.LRUCache(maxsize=4096)
 
 #######################
 ## CRF-BASED PARSING ##
@@ -27,8 +26,40 @@ ITEM_SEP_TEXTS = set(constants.ANDS + skills.constants.ITEM_SEPS)
 # and it improves performance on those fields, so... :shrug:
 LEVEL_TEXTS = set(skills.constants.LEVELS)
 
+# single-char symbols for each (non-"other") label, for matching sequences of labels
+_LABEL_SYMBOLS = {
+    "name": "n",
+    "keyword": "k",
+    "level": "l",
+    "field_sep": "f",
+    "item_sep": "i",
+}
+# "shapes" of run-length encoded label sequences, matched in order of priority;
+# each is written such that there's only one way for a sequence to match,
+# so a failed match never backtracks more than linearly
+_RE_LABELS_SHAPE = re.compile(
+    # junk lines, with key content probably split onto the next line
+    r"(?P<junk>l+f*|n+f+)"
+    # space-delimited list of names (or keywords)
+    r"|(?P<names>[nk]+)"
+    # name separated from a level
+    r"|(?P<name_level>n+f+l+f*)"
+    # char-delimited list of names (or keywords)
+    r"|(?P<names_delimited>n+(?:i+[nk]+)+)"
+    # char-delimited list of names with (optional) levels
+    r"|(?P<names_levels>n+(?:(?:f+l+f+i*|i+)n+)*(?:f+l+f+)?i*)"
+    # name explicitly separated from list of keywords (or names)
+    r"|(?P<name_keywords>n+f+k+(?:i+[nk]+)*)"
+    # level explicitly separated from list of names/keywords
+    r"|(?P<level_names_explicit>l+f+[nk]+(?:i+[nk]+)*)"
+    # level implicitly separated from list of names/keywords
+    r"|(?P<level_names_implicit>l+n+(?:i+[nk]+)*)"
+    # name explicitly separated from one or more names/keywords with levels
+    r"|(?P<name_names_levels>n+f+[nk]+(?:(?:f+l+f*i*|i+)[nk]+)*(?:f+l+f*)?i*)"
+)
+
 
-def parse_lines(lines, tagger=None):
+def parse_lines(lines, tagger=None, *, stats=None):
     """
     Parse a sequence of text lines belonging to the "skills" section of a résumé
     to produce structured data in the form of :class:`schemas.ResumeSkillSchema`
@@ -37,17 +68,52 @@ def parse_lines(lines, tagger=None):
     Args:
         lines (List[str])
         tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
+
+    Returns:
+        List[Dict[str, obj]]
+
+    See Also:
+        :func:`parse_tokens()`
+    """
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+
+    with stats.timer("skills.tokenize"):
+        tokens = tokenize.tokenize("\n".join(lines).strip())
+    stats.count("skills.n_lines", len(lines))
+    return parse_tokens(tokens, tagger=tagger, stats=stats)
+
+
+def parse_tokens(tokens, tagger=None, *, stats=None):
+    """
+    Parse a sequence of tokens belonging to the "skills" section of a résumé
+    to produce structured data in the form of :class:`schemas.ResumeSkillSchema`
+    using a trained Conditional Random Field (CRF) tagger.
+
+    Args:
+        tokens (List[:class:`spacy.tokens.Token`]): Section's lines joined by newlines,
+            stripped, then tokenized, e.g. via :func:`tokenize.tokenize_sections()`.
+        tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
 
     Returns:
         List[Dict[str, obj]]
     """
     if tagger is None:
         tagger = parse_utils.load_tagger(skills.FPATH_TAGGER)
-
-    tokens = tokenize.tokenize("\n".join(lines).strip())
-    features = featurize(tokens)
-    labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
-    data = _parse_labeled_tokens(labeled_tokens)
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+
+    with stats.timer("skills.featurize"):
+        features = featurize(tokens)
+    with stats.timer("skills.tag"):
+        labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
+    with stats.timer("skills.parse_labeled_tokens"):
+        data = _parse_labeled_tokens(labeled_tokens)
+    stats.count("skills.n_tokens", len(tokens))
     return data
 
 
@@ -90,35 +156,32 @@ def _parse_labeled_tokens(labeled_tokens):
         if not tok_labels:
             return []
 
-        labels_str = "".join(label for _, label in tok_labels)
+        shape = _get_labels_shape(label for _, label in tok_labels)
 
         # junk lines, with key content probably split onto the next line
         # nbd, next line's skills will probably get parsed just fine
-        if (
-            re.search(r"^(level)+(field_sep)*?$", labels_str) or
-            re.search(r"^(name)+(field_sep)+$", labels_str)
-        ):
+        if shape == "junk":
             pass
         # space-delimited list of names (or keywords)
         # note: this is a parser error -- they shouldn't be keywords -- but we can correct it
         # note: this is an ambiguous way to list skills; we assume each token is separate
-        elif re.search(r"^(name|keyword)+$", labels_str):
+        elif shape == "names":
             skills_data.extend({"name": tok.text} for tok, _ in tok_labels)
         # name separated from a level
-        elif re.search(r"^(name)+(field_sep)+(level)+(field_sep)*?$", labels_str):
+        elif shape == "name_level":
             skills_data.append({
                 "name": "".join(tok.text_with_ws for tok, label in tok_labels if label == "name").strip(),
                 "level": "".join(tok.text_with_ws for tok, label in tok_labels if label == "level").strip(),
             })
         # char-delimited list of names (or keywords)
-        elif re.search(r"^(name)+((item_sep)+(name|keyword)+)+$", labels_str):
+        elif shape == "names_delimited":
             skills_data.extend([
                 {"name": "".join(tok.text_with_ws for tok, label in tls).strip()}
                 for label, tls in itertools.groupby(tok_labels, key=operator.itemgetter(1))
                 if label != "item_sep"
             ])
         # char-delimited list of names with (optional) levels
-        elif re.search(r"^((name)+((field_sep)+(level)+(field_sep)+)?(item_sep)*?)+$", labels_str):
+        elif shape == "names_levels":
             for is_item_sep, tls in itertools.groupby(tok_labels, key=lambda tl: tl[1] == "item_sep"):
                 if not is_item_sep:
                     tls = list(tls)
@@ -127,7 +190,7 @@ def _parse_labeled_tokens(labeled_tokens):
                         "level": "".join(tok.text_with_ws for tok, label in tls if label == "level"),
                     })
         # name explicitly separated from list of keywords (or names)
-        elif re.search(r"^(name)+(field_sep)+(keyword)+((item_sep)+(keyword|name)+)*?$", labels_str):
+        elif shape == "name_keywords":
             field_sep_idx = [label for _, label in tok_labels].index("field_sep")
             skills_data.append({
                 "name": "".join(tok.text_with_ws for tok, _ in tok_labels[:field_sep_idx]).strip(),
@@ -140,7 +203,7 @@ def _parse_labeled_tokens(labeled_tokens):
         # level explicitly separated from list of names/keywords
         # note: tagging keywords after level + field_sep is an error
         # but we can catch it and fix it post-parse
-        elif re.search(r"^(level)+(field_sep)+(name|keyword)+((item_sep)+(name|keyword)+)*?$", labels_str):
+        elif shape == "level_names_explicit":
             field_sep_idx = [label for _, label in tok_labels].index("field_sep")
             level = "".join(
                 tok.text_with_ws
@@ -153,7 +216,7 @@ def _parse_labeled_tokens(labeled_tokens):
                 if label != "item_sep"
             ])
         # level implicitly separated from list of names/keywords
-        elif re.search(r"^(level)+(name)+((item_sep)+(name|keyword)+)*?$", labels_str):
+        elif shape == "level_names_implicit":
             name_idx = [label for _, label in tok_labels].index("name")
             level = "".join(
                 tok.text_with_ws
@@ -168,7 +231,7 @@ def _parse_labeled_tokens(labeled_tokens):
         # name explicitly separated from one or more names/keywords with levels
         # note: this isn't permitted by our resume schema, so we'll drop the leading name
         # and convert the keywords into their own names
-        elif re.search(r"^(name)+(field_sep)+((name|keyword)+((field_sep)+(level)+(field_sep)*?)?(item_sep)*?)+$", labels_str):
+        elif shape == "name_names_levels":
             field_sep_idx = [label for _, label in tok_labels].index("field_sep")
             for is_item_sep, tls in itertools.groupby(tok_labels[field_sep_idx + 1:], key=lambda tl: tl[1] == "item_sep"):
                 if not is_item_sep:
@@ -190,6 +253,26 @@ def _parse_labeled_tokens(labeled_tokens):
     return skills_data
 
 
+def _get_labels_shape(labels):
+    """
+    Get the "shape" of a sequence of ``labels``, which determines how its tokens
+    get parsed into skills data, by matching its run-length encoding — one symbol
+    per run of repeated labels — against a single, precompiled regex.
+
+    Args:
+        labels (Iterable[str])
+
+    Returns:
+        str or None: Name of the first matching shape in :obj:`_RE_LABELS_SHAPE`,
+        or None if ``labels`` don't match any of them.
+    """
+    symbols = "".join(
+        _LABEL_SYMBOLS.get(label, "?") for label, _ in itertools.groupby(labels)
+    )
+    match = _RE_LABELS_SHAPE.fullmatch(symbols)
+    return match.lastgroup if match is not None else None
+
+
 def featurize(tokens):
     """
     Extract features from individual tokens as well as those that are dependent on
@@ -199,47 +282,40 @@ def featurize(tokens):
         tokens (List[:class:`spacy.tokens.Token`])
 
     Returns:
-        List[Dict[str, obj]]
+        :class:`pycrfsuite.ItemSequence`
     """
-    tokens_features = [get_token_features(token) for token in tokens]
-    if len(tokens_features) == 1:
-        tokens_features[0]["_singleton"] = True
-        return tokens_features
+    tokens_lex_features = parse_utils.get_lexical_features(
+        tokens, get_token_features, cache=_LEXICAL_FEATURES_CACHE)
+    if len(tokens_lex_features) == 1:
+        return parse_utils.get_feature_items(tokens_lex_features)
     else:
-        feature_sequence = []
+        tokens_features = [features for features, _, _ in tokens_lex_features]
+        # add features dependent on each token's position within the sequence
+        # and its relationship to other tokens; those of its surrounding tokens
+        # are added for context when flattening into items
+        tokens_seq_features = []
         line_idx_windows = parse_utils.get_line_token_idxs(tokens_features)
         prev_line_idx, next_line_idx = next(line_idx_windows)
         follows_bullet = False
-        n_pad_l, n_pad_r = 3, 2
-        tokens_features = parse_utils.pad_tokens_features(
-            tokens_features, n_left=n_pad_l, n_right=n_pad_r)
-        tf_windows = itertoolz.sliding_window(n_pad_l + n_pad_r + 1, tokens_features)
-        for ppprev_tf, pprev_tf, prev_tf, curr_tf, next_tf, nnext_tf in tf_windows:
-            tf = curr_tf.copy()
-            # add features from surrounding tokens, for context
-            tf["ppprev"] = ppprev_tf
-            tf["pprev"] = pprev_tf
-            tf["prev"] = prev_tf
-            tf["next"] = next_tf
-            tf["nnext"] = nnext_tf
-            # add features dependent on this token's position within the sequence
-            # and its relationship to other tokens
-            tok_idx = tf["idx"]
-            if tf["is_newline"] and tf["idx"] > 0:
+        follows_group_sep = False
+        for tok_idx, tf in enumerate(tokens_features):
+            if tf["is_newline"] and tok_idx > 0:
                 prev_line_idx, next_line_idx = next(line_idx_windows)
                 follows_bullet = False
-            tf["tok_line_idx"] = tok_idx - prev_line_idx
-            tf["follows_bullet"] = follows_bullet
+                follows_group_sep = False
+            tok_line_idx = tok_idx - prev_line_idx
+            seq_tf = {
+                "tok_line_idx": tok_line_idx,
+                "follows_bullet": follows_bullet,
+                "follows_group_sep": follows_group_sep,
+            }
             # bullets have is_group_sep_text, but they aren't group separators
-            # at least not in the sense we want here; so, +2 to the previous newline idx
-            # ensures that bullets are not counted in this feature
-            line_tfs_so_far = tokens_features[prev_line_idx + n_pad_l + 2: tok_idx + n_pad_l]
-            if any(_tf["is_group_sep_text"] for _tf in line_tfs_so_far):
-                tf["follows_group_sep"] = True
-            else:
-                tf["follows_group_sep"] = False
-            feature_sequence.append(tf)
-        return feature_sequence
+            # at least not in the sense we want here; so, skipping the first two tokens
+            # after the previous newline ensures that bullets are not counted
+            if tok_line_idx >= 2 and tf["is_group_sep_text"]:
+                follows_group_sep = True
+            tokens_seq_features.append(seq_tf)
+        return parse_utils.get_feature_items(tokens_lex_features, tokens_seq_features)
 
 
 def get_token_features(token):
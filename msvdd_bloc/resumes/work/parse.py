@@ -4,13 +4,14 @@ import operator
 
 from toolz import itertoolz
 
-from msvdd_bloc import regexes, tokenize
+from msvdd_bloc import regexes, tokenize, utils
 from msvdd_bloc.resumes import constants
 from msvdd_bloc.resumes import parse_utils
 from msvdd_bloc.resumes import work
 
 
 LOGGER = logging.getLogger(__name__)
+_LEXICAL_FEATURES_CACHE = utils.LRUCache(maxsize=4096)
 
 FIELD_SEP_TEXTS = {
     sep for sep in itertoolz.concatv(
@@ -31,7 +32,7 @@ POSITION_TEXTS = set(
 )
 
 
-def parse_lines(lines, tagger=None):
+def parse_lines(lines, tagger=None, *, stats=None):
     """
     Parse a sequence of text lines belonging to the "work" section of a résumé
     to produce structured data in the form of :class:`schemas.ResumeWorkSchema`
@@ -40,17 +41,52 @@ def parse_lines(lines, tagger=None):
     Args:
         lines (List[str])
         tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
+
+    Returns:
+        List[Dict[str, obj]]
+
+    See Also:
+        :func:`parse_tokens()`
+    """
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+
+    with stats.timer("work.tokenize"):
+        tokens = tokenize.tokenize("\n".join(lines).strip())
+    stats.count("work.n_lines", len(lines))
+    return parse_tokens(tokens, tagger=tagger, stats=stats)
+
+
+def parse_tokens(tokens, tagger=None, *, stats=None):
+    """
+    Parse a sequence of tokens belonging to the "work" section of a résumé
+    to produce structured data in the form of :class:`schemas.ResumeWorkSchema`
+    using a trained Conditional Random Field (CRF) tagger.
+
+    Args:
+        tokens (List[:class:`spacy.tokens.Token`]): Section's lines joined by newlines,
+            stripped, then tokenized, e.g. via :func:`tokenize.tokenize_sections()`.
+        tagger (:class:`pycrfsuite.Tagger`)
+        stats (:class:`parse_utils.ParseStats`): If specified, record per-stage
+            timings and counts in this object.
 
     Returns:
         List[Dict[str, obj]]
     """
     if tagger is None:
         tagger = parse_utils.load_tagger(work.FPATH_TAGGER)
-
-    tokens = tokenize.tokenize("\n".join(lines).strip())
-    features = featurize(tokens)
-    labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
-    results = _parse_labeled_tokens(labeled_tokens)
+    if stats is None:
+        stats = parse_utils.NULL_STATS
+
+    with stats.timer("work.featurize"):
+        features = featurize(tokens)
+    with stats.timer("work.tag"):
+        labeled_tokens = parse_utils.tag(tokens, features, tagger=tagger)
+    with stats.timer("work.parse_labeled_tokens"):
+        results = _parse_labeled_tokens(labeled_tokens)
+    stats.count("work.n_tokens", len(tokens))
     return results
 
 
@@ -102,52 +138,42 @@ def featurize(tokens):
         tokens (List[:class:`spacy.tokens.Token`])
 
     Returns:
-        List[Dict[str, obj]]
+        :class:`pycrfsuite.ItemSequence`
     """
-    tokens_features = [get_token_features(token) for token in tokens]
-    if len(tokens_features) == 1:
-        tokens_features[0]["_singleton"] = True
-        return tokens_features
+    tokens_lex_features = parse_utils.get_lexical_features(
+        tokens, get_token_features, cache=_LEXICAL_FEATURES_CACHE)
+    if len(tokens_lex_features) == 1:
+        return parse_utils.get_feature_items(tokens_lex_features)
     else:
-        feature_sequence = []
+        tokens_features = [features for features, _, _ in tokens_lex_features]
+        # add features dependent on each token's position within the sequence
+        # and its relationship to other tokens; those of its surrounding tokens
+        # are added for context when flattening into items
+        tokens_seq_features = []
         line_idx_windows = parse_utils.get_line_token_idxs(tokens_features)
         prev_line_idx, next_line_idx = next(line_idx_windows)
+        line_years = parse_utils.get_line_years(
+            tokens_features, range(prev_line_idx, next_line_idx))
         follows_bullet = False
-        n_pad_l, n_pad_r = 3, 2
-        tokens_features = parse_utils.pad_tokens_features(
-            tokens_features, n_left=n_pad_l, n_right=n_pad_r)
-        tf_windows = itertoolz.sliding_window(n_pad_l + n_pad_r + 1, tokens_features)
-        for ppprev_tf, pprev_tf, prev_tf, curr_tf, next_tf, nnext_tf in tf_windows:
-            tf = curr_tf.copy()
-            # add features from surrounding tokens, for context
-            tf["ppprev"] = ppprev_tf
-            tf["pprev"] = pprev_tf
-            tf["prev"] = prev_tf
-            tf["next"] = next_tf
-            tf["nnext"] = nnext_tf
-            # add features dependent on this token's position within the sequence
-            # and its relationship to other tokens
-            tok_idx = tf["idx"]
-            line_tfs = tokens_features[prev_line_idx + n_pad_l : next_line_idx + n_pad_l]
-            if tf["is_newline"] and tf["idx"] > 0:
+        for tok_idx, tf in enumerate(tokens_features):
+            if tf["is_newline"] and tok_idx > 0:
                 prev_line_idx, next_line_idx = next(line_idx_windows)
+                line_years = parse_utils.get_line_years(
+                    tokens_features, range(prev_line_idx, next_line_idx))
                 follows_bullet = False
-            tf["tok_line_idx"] = tok_idx - prev_line_idx
-            tf["follows_bullet"] = follows_bullet
+            tok_line_idx = tok_idx - prev_line_idx
+            seq_tf = {"tok_line_idx": tok_line_idx, "follows_bullet": follows_bullet}
             # is this token a bullet? i.e. "- " token starting a new line
-            if tf["shape"] == "-" and tf["tok_line_idx"] == 1:
+            if tf["shape"] == "-" and tok_line_idx == 1:
                 follows_bullet = True
-            if tf["like_year"] is True:
-                year = int(curr_tf["prefix"] + curr_tf["suffix"])
-                other_years = [
-                    int(_tf["prefix"] + _tf["suffix"])
-                    for _tf in line_tfs
-                    if _tf["like_year"] is True and _tf["idx"] != tok_idx
-                ]
-                if other_years:
-                    tf["is_max_line_year"] = all(year > oyr for oyr in other_years)
-            feature_sequence.append(tf)
-        return feature_sequence
+            # is this year greater than all *other* years in its line?
+            max_year, n_max_years, n_years = line_years
+            if tf["like_year"] is True and n_years > 1:
+                seq_tf["is_max_line_year"] = (
+                    parse_utils.get_token_year(tf) == max_year and n_max_years == 1
+                )
+            tokens_seq_features.append(seq_tf)
+        return parse_utils.get_feature_items(tokens_lex_features, tokens_seq_features)
 
 
 def get_token_features(token):
@@ -2,6 +2,8 @@
 schemas
 -------
 """
+import collections.abc
+
 import marshmallow as ma
 
 from msvdd_bloc import regexes
@@ -394,3 +396,229 @@ class JobPostingSchema(ma.Schema):
     class Meta:
         # ignore any unknown keys
         unknown = ma.EXCLUDE
+
+
+def compile_loader(schema):
+    """
+    Compile ``schema`` into a function that loads data exactly as ``schema.load()``
+    would — same type checks, same validators, and same pruning of invalid values
+    from the loaded data — but without most of marshmallow's per-call overhead,
+    since the schema's fields are walked just once, up front.
+
+    Args:
+        schema (:class:`marshmallow.Schema`)
+
+    Returns:
+        Callable[[Dict[str, object]], Tuple[Dict[str, object], Dict[str, object]]]:
+        Function that takes data and returns its loaded data along with any error
+        messages; if there are errors, the loaded data is what ``schema.load()``
+        would've given as the raised :class:`marshmallow.ValidationError`'s
+        ``valid_data``, otherwise it's what ``schema.load()`` would've returned.
+
+    Note:
+        ``String``, ``List``, and ``Nested`` fields are handled here directly;
+        all others are delegated to their own ``deserialize()`` method.
+        Partial loading, pre-/post-load hooks, and schema-level validators
+        aren't supported, and the error messages are structured like marshmallow's
+        but may not match them word for word.
+    """
+    if schema.many:
+        raise ValueError("only schemas with `many=False` can be compiled")
+    load_schema = _compile_schema(schema, schema.unknown)
+
+    def load(data):
+        result, errors = load_schema(data)
+        return (result, errors or {})
+
+    return load
+
+
+def _compile_schema(schema, unknown):
+    """
+    Args:
+        schema (:class:`marshmallow.Schema`)
+        unknown (str)
+
+    Returns:
+        Callable[[object], Tuple[Dict[str, object], Dict[str, object]]]
+    """
+    if any(schema._hooks.values()):
+        raise ValueError(
+            "{} has hooks or schema-level validators, so it can't be compiled".format(
+                type(schema).__name__)
+        )
+    fields = [
+        (
+            field.data_key or name,
+            field.attribute or name,
+            _compile_field(field),
+            field.required or _get_load_default(field) is not ma.missing,
+        )
+        for name, field in schema.load_fields.items()
+    ]
+    data_keys = {data_key for data_key, _, _, _ in fields}
+    type_error = schema.error_messages["type"]
+    unknown_error = schema.error_messages["unknown"]
+
+    def load_schema(data):
+        if not isinstance(data, collections.abc.Mapping):
+            return ({}, {"_schema": [type_error]})
+        result = {}
+        errors = {}
+        for data_key, attribute, load_field, handles_missing in fields:
+            value = data.get(data_key, ma.missing)
+            if value is ma.missing and handles_missing is False:
+                continue
+            value, error = load_field(value)
+            if error:
+                errors[data_key] = error
+                # only truthy partially-valid data is kept, same as marshmallow
+                if not value:
+                    continue
+            elif value is ma.missing:
+                continue
+            result[attribute] = value
+        if unknown != ma.EXCLUDE:
+            for key, value in data.items():
+                if key not in data_keys:
+                    if unknown == ma.INCLUDE:
+                        result[key] = value
+                    else:
+                        errors[key] = [unknown_error]
+        return (result, errors or None)
+
+    return load_schema
+
+
+def _compile_field(field):
+    """
+    Args:
+        field (:class:`marshmallow.fields.Field`)
+
+    Returns:
+        Callable[[object], Tuple[object, object]]: Function that takes a raw value
+        and returns its loaded value and error messages, if any; if there are errors,
+        the loaded value is the field's partially-valid data, or None.
+    """
+    field_type = type(field)
+    if field_type is ma.fields.String:
+        load_value = _compile_string(field)
+    elif field_type is ma.fields.List:
+        load_value = _compile_list(field)
+    elif field_type is ma.fields.Nested:
+        load_value = _compile_nested(field)
+    else:
+        return _compile_generic(field)
+
+    null_error = field.error_messages["null"]
+    allow_none = field.allow_none
+    validators = field.validators
+
+    def load_field(value):
+        if value is ma.missing:
+            return _compile_generic(field)(value)
+        elif value is None:
+            return (None, None) if allow_none else (None, [null_error])
+        value, error = load_value(value)
+        if error is None and validators:
+            error = _run_validators(field, value)
+            if error is not None:
+                value = None
+        return (value, error)
+
+    return load_field
+
+
+def _compile_generic(field):
+    def load_generic(value):
+        try:
+            return (field.deserialize(value), None)
+        except ma.ValidationError as e:
+            return (e.valid_data, e.messages)
+
+    return load_generic
+
+
+def _compile_string(field):
+    invalid_error = field.error_messages["invalid"]
+    invalid_utf8_error = field.error_messages["invalid_utf8"]
+
+    def load_string(value):
+        if isinstance(value, str):
+            return (value, None)
+        elif isinstance(value, bytes):
+            try:
+                return (value.decode("utf-8"), None)
+            except UnicodeDecodeError:
+                return (None, [invalid_utf8_error])
+        else:
+            return (None, [invalid_error])
+
+    return load_string
+
+
+def _compile_list(field):
+    load_item = _compile_field(field.inner)
+    invalid_error = field.error_messages["invalid"]
+
+    def load_list(value):
+        if not ma.utils.is_collection(value):
+            return (None, [invalid_error])
+        result = []
+        errors = {}
+        for idx, item in enumerate(value):
+            item, error = load_item(item)
+            if error:
+                errors[idx] = error
+                if item is None:
+                    continue
+            result.append(item)
+        return (result, errors or None)
+
+    return load_list
+
+
+def _compile_nested(field):
+    load_schema = _compile_schema(field.schema, field.unknown or field.schema.unknown)
+    type_error = field.error_messages["type"]
+    if field.schema.many is False:
+        return load_schema
+
+    def load_many(value):
+        if not ma.utils.is_collection(value):
+            return (None, [type_error])
+        result = []
+        errors = {}
+        for idx, item in enumerate(value):
+            item, error = load_schema(item)
+            if error:
+                errors[idx] = error
+            result.append(item)
+        return (result, errors or None)
+
+    return load_many
+
+
+def _run_validators(field, value):
+    """
+    Args:
+        field (:class:`marshmallow.fields.Field`)
+        value (object)
+
+    Returns:
+        List[str] or None
+    """
+    errors = []
+    for validator in field.validators:
+        try:
+            # plain callables fail by returning False, validator instances by raising
+            if validator(value) is False and not isinstance(validator, ma.validate.Validator):
+                errors.append(field.error_messages["validator_failed"])
+        except ma.ValidationError as e:
+            errors.extend(e.messages if isinstance(e.messages, list) else [e.messages])
+    return errors or None
+
+
+def _get_load_default(field):
+    # marshmallow renamed this attribute in v3.13
+    return getattr(field, "load_default", getattr(field, "missing", ma.missing))
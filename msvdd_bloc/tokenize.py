@@ -6,6 +6,7 @@ Segment text into its constituent tokens using spaCy.
 """
 import spacy
 from spacy.tokens import Doc
+from toolz import itertoolz
 
 
 def tokenize(line):
@@ -28,6 +29,108 @@ def tokenize(line):
         raise TypeError("`line` must be a str or List[str], not {}".format(type(line)))
 
 
+def tokenize_many(lines, *, batch_size=1000):
+    """
+    Split each of ``lines`` into a sequence of spaCy tokens, to be featurized,
+    streaming them through the tokenizer's pipeline in batches, which is faster
+    than calling :func:`tokenize()` on each line one at a time.
+
+    Args:
+        lines (Iterable[List[str] or str]): Stream of lines, each as in :func:`tokenize()`.
+        batch_size (int): Number of lines to tokenize at a time.
+
+    Yields:
+        List[:class:`spacy.tokens.Token`]: Tokens for the next line in ``lines``.
+    """
+    for batch in itertoolz.partition_all(batch_size, lines):
+        # already-tokenized lines don't go through the pipeline, so leave them out
+        docs = iter(
+            TOKENIZER.pipe(
+                (line for line in batch if isinstance(line, str)), batch_size=batch_size)
+        )
+        for line in batch:
+            if isinstance(line, str):
+                yield [tok for tok in next(docs)]
+            else:
+                yield tokenize(line)
+
+
+def tokenize_sections(texts):
+    """
+    Split each of ``texts`` into a sequence of spaCy tokens, to be featurized,
+    but tokenize them all together in a single pass through the tokenizer's pipeline
+    rather than making a separate ``Doc`` for each.
+
+    Args:
+        texts (List[str]): Texts to be split into tokens, e.g. the lines of each section
+            of a résumé, joined by newlines. Texts should be stripped of leading and
+            trailing whitespace, otherwise they may be tokenized separately.
+
+    Returns:
+        List[List[:class:`spacy.tokens.Token`]]: Tokens for each text in ``texts``,
+        in the same order, and with the same texts and attributes as those produced
+        by :func:`tokenize()`.
+
+    Note:
+        Texts are joined by blank lines, which are always split into tokens of their own,
+        so tokens never cross from one text into another. However, tokens all belong
+        to the same ``Doc``, so a text's first token's index, ``Token.i``,
+        is *not* necessarily 0.
+    """
+    return _split_sections_doc(TOKENIZER(_SECTION_SEP.join(texts)), texts)
+
+
+def tokenize_sections_many(texts_groups, *, batch_size=100):
+    """
+    Split each of the ``texts`` in each group of ``texts_groups`` into a sequence of
+    spaCy tokens, as in :func:`tokenize_sections()`, streaming groups through
+    the tokenizer's pipeline in batches.
+
+    Args:
+        texts_groups (Iterable[List[str]]): Stream of groups of texts, e.g. the texts
+            for each section of each of many résumés.
+        batch_size (int): Number of groups to tokenize at a time.
+
+    Yields:
+        List[List[:class:`spacy.tokens.Token`]]: Tokens for each text in the next
+        group in ``texts_groups``.
+    """
+    for batch in itertoolz.partition_all(batch_size, texts_groups):
+        docs = TOKENIZER.pipe(
+            (_SECTION_SEP.join(texts) for texts in batch), batch_size=batch_size)
+        for doc, texts in zip(docs, batch):
+            yield _split_sections_doc(doc, texts)
+
+
+def _split_sections_doc(doc, texts):
+    """
+    Split ``doc``, made from ``texts`` joined by :obj:`_SECTION_SEP`,
+    back into the tokens for each of its constituent texts.
+
+    Args:
+        doc (:class:`spacy.tokens.Doc`)
+        texts (List[str])
+
+    Returns:
+        List[List[:class:`spacy.tokens.Token`]]
+    """
+    texts_tokens = []
+    start_char = 0
+    for text in texts:
+        end_char = start_char + len(text)
+        if not text:
+            texts_tokens.append([])
+        else:
+            span = doc.char_span(start_char, end_char)
+            # token boundaries don't line up with this text's boundaries, so fall back
+            if span is None:
+                texts_tokens.append(tokenize(text))
+            else:
+                texts_tokens.append([tok for tok in span])
+        start_char = end_char + len(_SECTION_SEP)
+    return texts_tokens
+
+
 class PhoneNumberMerger:
     """
     Custom spaCy pipeline component that merges contiguous tokens matching
@@ -87,3 +190,6 @@ class DateRangeSplitter:
 TOKENIZER = spacy.blank("en")
 TOKENIZER.add_pipe(PhoneNumberMerger(TOKENIZER), last=True)
 TOKENIZER.add_pipe(DateRangeSplitter(TOKENIZER), last=True)
+
+# blank lines are always split into tokens of their own, so they cleanly separate texts
+_SECTION_SEP = "\n\n"
@@ -2,6 +2,12 @@
 utils
 -----
 """
+import collections
+import multiprocessing
+import os
+import threading
+
+from toolz import itertoolz
 
 
 def to_collection(val, val_type, col_type):
@@ -71,3 +77,126 @@ def chunk_items(items, chunk_size):
     """
     for i in range(0, len(items), chunk_size):
         yield items[i : min(i + chunk_size, len(items))]
+
+
+def map_chunks(func, items, *, chunk_size, n_process=1, initializer=None):
+    """
+    Apply ``func`` to successive chunks of ``items``, optionally spread across
+    multiple worker processes, and yield its per-item results in input order.
+
+    Args:
+        func (Callable): Function that takes a list of items and returns a list
+            of per-item results. If ``n_process`` > 1, it must be picklable,
+            i.e. defined at the top level of a module.
+        items (Iterable)
+        chunk_size (int): Number of items passed to ``func`` at a time.
+        n_process (int): Number of worker processes. If 1, all items are processed
+            in the current process; if -1, use as many processes as there are CPUs.
+        initializer (Callable): If specified, function called once per worker process
+            before it processes any items, e.g. to load models into memory.
+
+    Yields:
+        object: Next result, in the same order as ``items``.
+
+    Note:
+        At most ``2 * n_process`` chunks are in flight at any given time,
+        so memory use stays flat even when ``items`` is a very long stream.
+    """
+    if n_process == -1:
+        n_process = os.cpu_count() or 1
+    if n_process < 1:
+        raise ValueError("`n_process` must be a positive integer or -1")
+    chunks = (list(chunk) for chunk in itertoolz.partition_all(chunk_size, items))
+    if n_process == 1:
+        if initializer is not None:
+            initializer()
+        for chunk in chunks:
+            yield from func(chunk)
+    else:
+        with multiprocessing.Pool(processes=n_process, initializer=initializer) as pool:
+            pending = collections.deque()
+            for chunk in chunks:
+                pending.append(pool.apply_async(func, (chunk,)))
+                if len(pending) >= 2 * n_process:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe mapping that evicts its least-recently used item once full,
+    and keeps count of its hits and misses.
+
+    Args:
+        maxsize (int): Maximum number of items held in the cache.
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """
+        Get the value cached for ``key``, if any, marking it as most-recently used.
+
+        Args:
+            key (hashable)
+            default (object): Value returned if ``key`` isn't in the cache.
+
+        Returns:
+            object
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """
+        Cache ``value`` for ``key``, evicting the least-recently used item if full.
+
+        Args:
+            key (hashable)
+            value (object)
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all items from the cache and reset its hit and miss counts."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """
+        Returns:
+            Dict[str, int]: Cache hits, misses, current size, and maximum size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
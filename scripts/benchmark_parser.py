@@ -0,0 +1,497 @@
+#!/usr/bin/env python
+"""
+Script to benchmark the speed of the résumé parsing pipeline, both end to end
+and stage by stage, on the fake résumé PDF used in tests plus corpora of fake résumés
+of various sizes synthesized by the sections' ``generate`` modules.
+
+Results are saved as JSON, along with metadata about the code and machine on which
+they were run, so that runs can be compared across commits on the same machine.
+
+Examples:
+
+.. code-block::
+
+    $ python scripts/benchmark_parser.py --out_filepath ./data/benchmarks/before.json
+    $ python scripts/benchmark_parser.py --out_filepath ./data/benchmarks/after.json --compare_filepath ./data/benchmarks/before.json
+    $ python scripts/benchmark_parser.py --out_filepath ./data/benchmarks/tag.json --cases tag.basics tag.work --n_docs 10 100
+"""
+import argparse
+import datetime
+import logging
+import os
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import msvdd_bloc
+from msvdd_bloc import fileio, tokenize
+from msvdd_bloc.resumes import basics, education, skills, work
+from msvdd_bloc.resumes import extract, generate_utils, munge, parse, parse_utils, segment
+
+
+logging.basicConfig(
+    format="%(name)s : %(asctime)s : %(levelname)s : %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+    level=logging.INFO,
+)
+LOGGER = logging.getLogger("benchmark_parser")
+# parsing fake résumés emits lots of validation warnings, which aren't of interest here
+logging.getLogger("msvdd_bloc").setLevel(logging.ERROR)
+
+SECTION_MODULES = {
+    "basics": basics,
+    "education": education,
+    "skills": skills,
+    "work": work,
+}
+SECTION_HEADERS = {"education": "EDUCATION", "skills": "SKILLS", "work": "EXPERIENCE"}
+FPATH_FAKE_RESUME = msvdd_bloc.ROOT_DIR.joinpath("tests", "data", "fake-resume.pdf")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the speed of résumé parsing, end to end and stage by stage, "
+            "and save the results to a .json file."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    LOGGER.setLevel(args.loglevel)
+
+    cases = get_cases()
+    import_cases = get_import_cases()
+    if args.cases:
+        unknown_cases = set(args.cases) - set(cases.keys()) - set(import_cases.keys())
+        if unknown_cases:
+            parser.error(
+                "unknown cases {}; valid options are {}".format(
+                    sorted(unknown_cases), sorted(list(cases) + list(import_cases)))
+            )
+        cases = {name: case for name, case in cases.items() if name in args.cases}
+        import_cases = {
+            name: func for name, func in import_cases.items() if name in args.cases
+        }
+
+    # import times don't depend on any corpus, so they're only timed once
+    results = []
+    for case_name, func in import_cases.items():
+        times = time_func(func, n_repeats=args.n_repeats, min_time=args.min_time)
+        result = {"case": case_name, "corpus": None}
+        result.update(_summarize_times(times))
+        results.append(result)
+        LOGGER.info("%s: min = %.5fs", case_name, result["min"])
+
+    corpora = {"fake-resume": [load_fake_resume_text()]}
+    for n_docs in args.n_docs:
+        corpora["synthetic-{}".format(n_docs)] = generate_resume_texts(n_docs, seed=args.seed)
+
+    # load everything that's loaded lazily up front, so it doesn't count against the first case
+    parse.load_taggers()
+    for texts in corpora.values():
+        parse.parse_text(texts[0])
+
+    for corpus_name, texts in corpora.items():
+        inputs = prepare_inputs(texts)
+        for case_name, case in cases.items():
+            func, n_items = case(inputs)
+            times = time_func(func, n_repeats=args.n_repeats, min_time=args.min_time)
+            result = {
+                "case": case_name,
+                "corpus": corpus_name,
+                "n_docs": len(texts),
+                "n_items": n_items,
+            }
+            result.update(_summarize_times(times))
+            result["per_doc"] = min(times) / len(texts)
+            results.append(result)
+            LOGGER.info(
+                "%s on %s: min = %.5fs, per doc = %.6fs",
+                case_name, corpus_name, result["min"], result["per_doc"],
+            )
+
+    data = {"metadata": get_metadata(args), "results": results}
+    args.out_filepath.parent.mkdir(parents=True, exist_ok=True)
+    fileio.save_json(args.out_filepath, data, lines=False)
+    LOGGER.info("benchmark results saved to %s", args.out_filepath)
+
+    if args.compare_filepath:
+        compare_results(results, next(fileio.load_json(args.compare_filepath, lines=False)))
+    return 0
+
+
+def add_arguments(parser):
+    """
+    Add arguments to ``parser``, modifying it in-place.
+
+    Args:
+        parser (:class:`argparse.ArgumentParser`)
+    """
+    parser.add_argument(
+        "--out_filepath", type=pathlib.Path, required=True,
+        help="path to .json file on disk to which benchmark results are saved",
+    )
+    parser.add_argument(
+        "--compare_filepath", type=pathlib.Path, default=None,
+        help="path to .json file on disk with results of a previous benchmark run, "
+        "e.g. on another commit, with which to compare this run's results",
+    )
+    parser.add_argument(
+        "--cases", type=str, nargs="+", default=None,
+        help="names of benchmark cases to run, e.g. 'normalize_text' or 'featurize.work'; "
+        "if not specified, all cases are run",
+    )
+    parser.add_argument(
+        "--n_docs", type=int, nargs="+", default=[10, 50, 200],
+        help="number of fake résumés in each synthesized corpus to benchmark",
+    )
+    parser.add_argument(
+        "--n_repeats", type=int, default=5,
+        help="minimum number of times each case is timed on each corpus",
+    )
+    parser.add_argument(
+        "--min_time", type=float, default=0.5,
+        help="minimum total number of seconds for which each case is timed on each corpus",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=42,
+        help="seed for random number generators used to synthesize corpora, "
+        "so that runs are comparable",
+    )
+    parser.add_argument(
+        "--loglevel", type=int, default=logging.INFO,
+        help="numeric value of logging level above which you want to see messages; "
+        "see: https://docs.python.org/3/library/logging.html#logging-levels",
+    )
+
+
+def load_fake_resume_text():
+    """
+    Returns:
+        str: Text extracted from the fake résumé PDF used in tests.
+    """
+    # pdfminer rather than tika, so results don't depend on a running tika server
+    return extract.extract_text_from_pdf_pdfminer(FPATH_FAKE_RESUME)
+
+
+def generate_resume_texts(n, *, seed=42):
+    """
+    Synthesize ``n`` fake résumé texts, with a basics section up top followed by
+    work, education, and skills sections of varying lengths under their own headers.
+
+    Args:
+        n (int)
+        seed (int)
+
+    Returns:
+        List[str]
+    """
+    random.seed(seed)
+    for module in SECTION_MODULES.values():
+        module.generate.FAKER.seed_instance(seed)
+    texts = []
+    for i in range(n):
+        n_items = 1 + i % 4
+        text_sections = [_generate_section_text(basics, 1)]
+        for section in ("work", "education", "skills"):
+            text_sections.append(
+                SECTION_HEADERS[section] + "\n" +
+                _generate_section_text(SECTION_MODULES[section], n_items)
+            )
+        texts.append("\n\n".join(text_sections))
+    return texts
+
+
+def _generate_section_text(module, n):
+    labeled_tokens = generate_utils.generate_labeled_tokens(
+        module.generate.TEMPLATES, module.generate.FIELDS, n=n,
+    )
+    return "\n".join(" ".join(tok for tok, _ in ltoks) for ltoks in labeled_tokens)
+
+
+def prepare_inputs(texts):
+    """
+    Run ``texts`` through the parsing pipeline once, keeping each stage's outputs
+    so that later stages can be benchmarked in isolation.
+
+    Args:
+        texts (List[str])
+
+    Returns:
+        Dict[str, object]
+    """
+    norm_texts = [munge.normalize_text(text) for text in texts]
+    texts_lines = [munge.get_filtered_text_lines(norm_text) for norm_text in norm_texts]
+    sections_lines = [segment.get_section_lines(text_lines) for text_lines in texts_lines]
+    inputs = {
+        "texts": texts,
+        "norm_texts": norm_texts,
+        "texts_lines": texts_lines,
+        "sections_lines": sections_lines,
+    }
+    for section, module in SECTION_MODULES.items():
+        if section == "basics":
+            lines = [
+                section_lines.get("start", []) + section_lines.get("basics", [])
+                for section_lines in sections_lines
+            ]
+        else:
+            lines = [section_lines.get(section, []) for section_lines in sections_lines]
+        section_texts = ["\n".join(section_lines).strip() for section_lines in lines]
+        tokens = [tokenize.tokenize(section_text) for section_text in section_texts]
+        inputs[section] = {
+            "texts": section_texts,
+            "tokens": tokens,
+            "features": [module.parse.featurize(toks) for toks in tokens],
+            "tagger": parse_utils.load_tagger(module.FPATH_TAGGER),
+        }
+    return inputs
+
+
+def get_cases():
+    """
+    Get all per-corpus benchmark cases, each of which takes prepared inputs and returns
+    a no-arg function to be timed plus the number of items that it processes.
+
+    Returns:
+        Dict[str, Callable]
+    """
+    cases = {
+        "normalize_text": lambda inputs: (
+            lambda: [munge.normalize_text(text) for text in inputs["texts"]],
+            sum(len(text) for text in inputs["texts"]),
+        ),
+        "get_filtered_text_lines": lambda inputs: (
+            lambda: [munge.get_filtered_text_lines(text) for text in inputs["norm_texts"]],
+            sum(len(text) for text in inputs["norm_texts"]),
+        ),
+        "get_section_lines": lambda inputs: (
+            lambda: [segment.get_section_lines(lines) for lines in inputs["texts_lines"]],
+            sum(len(lines) for lines in inputs["texts_lines"]),
+        ),
+        "tokenize": lambda inputs: (
+            lambda: [
+                tokenize.tokenize(text)
+                for section in SECTION_MODULES
+                for text in inputs[section]["texts"]
+            ],
+            sum(len(toks) for section in SECTION_MODULES for toks in inputs[section]["tokens"]),
+        ),
+        "tokenize_many": lambda inputs: (
+            lambda: list(
+                tokenize.tokenize_many(
+                    text for section in SECTION_MODULES for text in inputs[section]["texts"]
+                )
+            ),
+            sum(len(toks) for section in SECTION_MODULES for toks in inputs[section]["tokens"]),
+        ),
+        "parse_text": lambda inputs: (
+            lambda: [parse.parse_text(text) for text in inputs["texts"]],
+            len(inputs["texts"]),
+        ),
+        "parse_text.validate_fast": lambda inputs: (
+            lambda: [parse.parse_text(text, validate="fast") for text in inputs["texts"]],
+            len(inputs["texts"]),
+        ),
+        "parse_text.validate_off": lambda inputs: (
+            lambda: [parse.parse_text(text, validate="off") for text in inputs["texts"]],
+            len(inputs["texts"]),
+        ),
+        "parse_texts": lambda inputs: (
+            lambda: list(parse.parse_texts(inputs["texts"])),
+            len(inputs["texts"]),
+        ),
+    }
+    for section, module in SECTION_MODULES.items():
+        cases["featurize." + section] = _make_featurize_case(section, module)
+        cases["featurize_uncached." + section] = _make_featurize_case(
+            section, module, cached=False)
+        cases["tag." + section] = _make_tag_case(section)
+    cases["featurize.skills_500"] = _make_long_skills_featurize_case(500)
+    return cases
+
+
+def get_import_cases():
+    """
+    Get benchmark cases for the time it takes to import the package's modules,
+    which don't depend on any corpus of inputs, so are timed separately.
+
+    Returns:
+        Dict[str, Callable]: Mapping of case name to function to be timed.
+    """
+    return {
+        "import.msvdd_bloc": _make_import_func("import msvdd_bloc"),
+        "import.parse": _make_import_func("from msvdd_bloc.resumes import parse"),
+    }
+
+
+def _make_featurize_case(section, module, *, cached=True):
+    def featurize_uncached(tokens):
+        # as when featurizing (mostly) unseen texts, e.g. training data
+        module.parse._LEXICAL_FEATURES_CACHE.clear()
+        return [module.parse.featurize(toks) for toks in tokens]
+
+    def case(inputs):
+        tokens = inputs[section]["tokens"]
+        if cached is True:
+            func = lambda: [module.parse.featurize(toks) for toks in tokens]
+        else:
+            func = lambda: featurize_uncached(tokens)
+        return (func, sum(len(toks) for toks in tokens))
+    return case
+
+
+def _make_long_skills_featurize_case(n_tokens):
+    def case(inputs):
+        # comma-separated lists of skills make for long lines, so stitch each résumé's
+        # skills section into a single line and repeat it up to ``n_tokens`` tokens
+        tokens = []
+        for text in inputs["skills"]["texts"]:
+            line = ", ".join(line for line in text.splitlines() if line) or "Python"
+            toks = tokenize.tokenize(", ".join([line] * (n_tokens // 2)))[:n_tokens]
+            tokens.append(toks)
+        return (
+            lambda: [skills.parse.featurize(toks) for toks in tokens],
+            sum(len(toks) for toks in tokens),
+        )
+    return case
+
+
+def _make_tag_case(section):
+    def case(inputs):
+        tokens = inputs[section]["tokens"]
+        features = inputs[section]["features"]
+        tagger = inputs[section]["tagger"]
+        return (
+            lambda: [
+                parse_utils.tag(toks, feats, tagger=tagger)
+                for toks, feats in zip(tokens, features)
+            ],
+            sum(len(toks) for toks in tokens),
+        )
+    return case
+
+
+def _make_import_func(statement):
+    # import in a fresh interpreter, since modules are only ever imported once per process
+    return lambda: subprocess.run(
+        [sys.executable, "-c", statement], cwd=str(msvdd_bloc.ROOT_DIR), check=True,
+    )
+
+
+def time_func(func, *, n_repeats, min_time):
+    """
+    Time calls to ``func`` at least ``n_repeats`` times and for at least ``min_time`` seconds.
+
+    Args:
+        func (Callable)
+        n_repeats (int)
+        min_time (float)
+
+    Returns:
+        List[float]: Wall time in seconds of each call.
+    """
+    times = []
+    while len(times) < n_repeats or sum(times) < min_time:
+        start_time = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start_time)
+    return times
+
+
+def _summarize_times(times):
+    """
+    Args:
+        times (List[float])
+
+    Returns:
+        Dict[str, float]
+    """
+    return {
+        "n_calls": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def get_metadata(args):
+    """
+    Get metadata about the code and machine on which the benchmark is run.
+
+    Args:
+        args (:class:`argparse.Namespace`)
+
+    Returns:
+        Dict[str, object]
+    """
+    import spacy
+
+    return {
+        "datetime": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _get_git_output("rev-parse", "HEAD"),
+        "git_dirty": bool(_get_git_output("status", "--porcelain", "--untracked-files=no")),
+        "version": msvdd_bloc.__version__,
+        "python_version": platform.python_version(),
+        "spacy_version": spacy.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "args": {
+            key: str(val) if isinstance(val, pathlib.Path) else val
+            for key, val in vars(args).items()
+        },
+    }
+
+
+def _get_git_output(*args):
+    try:
+        return subprocess.run(
+            ["git"] + list(args),
+            cwd=str(msvdd_bloc.ROOT_DIR),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        ).stdout.decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(results, other_data):
+    """
+    Log the speedup of each case in ``results`` relative to the same case and corpus
+    in a previous benchmark run's ``other_data``.
+
+    Args:
+        results (List[Dict[str, object]])
+        other_data (Dict[str, object])
+    """
+    other_results = {
+        (result["case"], result["corpus"]): result for result in other_data["results"]
+    }
+    LOGGER.info(
+        "comparing with results from commit %s", other_data["metadata"].get("git_commit"),
+    )
+    for result in results:
+        other_result = other_results.get((result["case"], result["corpus"]))
+        if other_result is None:
+            continue
+        if result["corpus"] is None:
+            name = result["case"]
+        else:
+            name = "{} on {}".format(result["case"], result["corpus"])
+        LOGGER.info(
+            "%s: %.5fs => %.5fs (%.2fx)",
+            name, other_result["min"], result["min"], other_result["min"] / result["min"],
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
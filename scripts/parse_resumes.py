@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+"""
+Script to parse a corpus of résumé PDFs into structured data. Walk a directory
+(or a .zip archive) of résumé .pdf files, extract and parse each one, and stream
+the results to a .jsonl file as soon as they're available.
+
+A manifest of finished files is recorded alongside the output, so an interrupted run
+picks up where it left off when re-run with the same arguments, without re-extracting
+any files that were already handled.
+
+Examples:
+
+.. code-block::
+
+    $ python scripts/parse_resumes.py --in_path /path/to/data/resumes --out_filepath ./data/resumes/parsed_resumes.jsonl --n_process 4
+    $ python scripts/parse_resumes.py --in_path /path/to/data/resumes.zip --out_filepath ./data/resumes/parsed_resumes.jsonl --n_process -1
+"""
+import argparse
+import functools
+import io
+import json
+import logging
+import os
+import pathlib
+import sys
+import zipfile
+
+import msvdd_bloc
+from msvdd_bloc import utils
+
+
+logging.basicConfig(
+    format="%(name)s : %(asctime)s : %(levelname)s : %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+    level=logging.INFO,
+)
+LOGGER = logging.getLogger("parse_resumes")
+logging.getLogger("pdfminer").setLevel(logging.WARNING)  # shush, pdfminer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "From a directory or .zip archive of résumé .pdf files, extract and parse "
+            "each file, then stream the parsed résumés to a .jsonl file."
+        ),
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    LOGGER.setLevel(args.loglevel)
+
+    manifest_filepath = args.manifest_filepath or args.out_filepath.with_suffix(".manifest.jsonl")
+    finished, offset = load_manifest(manifest_filepath)
+    if args.retry_failed is True:
+        finished = {
+            fname: status for fname, status in finished.items() if status != "failed"
+        }
+    LOGGER.info("found %s finished files in manifest %s", len(finished), manifest_filepath)
+
+    # drop any results written after the last manifest entry, e.g. by an interrupted run
+    # so that each file appears in the output exactly once
+    with io.open(args.out_filepath, mode="ab") as f:
+        if f.tell() > offset:
+            f.truncate(offset)
+
+    items = iter_pdfs(args.in_path, skip=finished)
+    results = utils.map_chunks(
+        functools.partial(
+            extract_and_parse_pdfs,
+            min_text_len=args.min_text_len,
+            extract_timeout=args.extract_timeout,
+            extract_max_pages=args.extract_max_pages,
+            extract_max_chars=args.extract_max_chars,
+        ),
+        items,
+        chunk_size=args.chunk_size,
+        n_process=args.n_process,
+        initializer=msvdd_bloc.resumes.parse.load_taggers,
+    )
+    n_parsed = n_skipped = 0
+    with io.open(args.out_filepath, mode="ab") as f_out, \
+            io.open(manifest_filepath, mode="ab") as f_manifest:
+        for fname, status, data in results:
+            if status == "parsed":
+                record = {"filename": fname, "resume": data}
+                f_out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                f_out.flush()
+                n_parsed += 1
+            else:
+                n_skipped += 1
+            entry = {"filename": fname, "status": status, "offset": f_out.tell()}
+            f_manifest.write(json.dumps(entry).encode("utf-8") + b"\n")
+            f_manifest.flush()
+            if (n_parsed + n_skipped) % args.log_every == 0:
+                LOGGER.info("parsed %s files, skipped %s files so far", n_parsed, n_skipped)
+
+    LOGGER.info(
+        "parsed %s files and skipped %s files; results saved to %s",
+        n_parsed, n_skipped, args.out_filepath,
+    )
+    return 0
+
+
+def add_arguments(parser):
+    """
+    Add arguments to ``parser``, modifying it in-place.
+
+    Args:
+        parser (:class:`argparse.ArgumentParser`)
+    """
+    parser.add_argument(
+        "--in_path", type=pathlib.Path, required=True,
+        help="path to directory or .zip archive on disk in which résumé PDFs are saved",
+    )
+    parser.add_argument(
+        "--out_filepath", type=pathlib.Path, required=True,
+        help="path to .jsonl file on disk to which parsed résumés are appended",
+    )
+    parser.add_argument(
+        "--manifest_filepath", type=pathlib.Path, default=None,
+        help="path to .jsonl file on disk in which finished files are recorded; "
+        "if not specified, it's saved next to `out_filepath` with a '.manifest.jsonl' suffix",
+    )
+    parser.add_argument(
+        "--min_text_len", type=int, default=150,
+        help="minimum number of characters in an extracted text for it to be accepted",
+    )
+    parser.add_argument(
+        "--extract_timeout", type=float, default=None,
+        help="if specified, run all text extraction methods concurrently, waiting "
+        "at most this many seconds for each; otherwise, run them one after another",
+    )
+    parser.add_argument(
+        "--extract_max_pages", type=int, default=10,
+        help="maximum number of pages from which to extract text per PDF",
+    )
+    parser.add_argument(
+        "--extract_max_chars", type=int, default=None,
+        help="if specified, stop extracting text from a PDF after the page "
+        "on which this many characters have been reached",
+    )
+    parser.add_argument(
+        "--n_process", type=int, default=1,
+        help="number of worker processes used to extract and parse files; "
+        "if -1, use as many processes as there are CPUs",
+    )
+    parser.add_argument(
+        "--chunk_size", type=int, default=10,
+        help="number of files sent to a worker process at a time",
+    )
+    parser.add_argument(
+        "--retry_failed", action="store_true", default=False,
+        help="if specified, retry files that previously failed with an error, "
+        "rather than skipping them along with all other finished files",
+    )
+    parser.add_argument(
+        "--log_every", type=int, default=100,
+        help="number of finished files between progress log messages",
+    )
+    parser.add_argument(
+        "--loglevel", type=int, default=logging.INFO,
+        help="numeric value of logging level above which you want to see messages; "
+        "see: https://docs.python.org/3/library/logging.html#logging-levels",
+    )
+
+
+def load_manifest(filepath):
+    """
+    Load the record of finished files stored at ``filepath``, if it exists.
+
+    Args:
+        filepath (:class:`pathlib.Path`)
+
+    Returns:
+        Tuple[Dict[str, str], int]: Mapping of finished filename to its status,
+        and the size in bytes of the output file as of the last finished file.
+
+    Note:
+        If the last entry in the manifest was only partially written, e.g. because
+        the previous run was killed, it's removed from the file.
+    """
+    finished = {}
+    offset = 0
+    if not filepath.is_file():
+        return (finished, offset)
+    good_size = 0
+    with io.open(filepath, mode="rb") as f:
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError()
+                entry = json.loads(line.decode("utf-8"))
+            except ValueError:
+                LOGGER.warning("ignoring partially-written manifest entry %s", line)
+                break
+            finished[entry["filename"]] = entry["status"]
+            offset = entry["offset"]
+            good_size += len(line)
+    with io.open(filepath, mode="ab") as f:
+        f.truncate(good_size)
+    return (finished, offset)
+
+
+def iter_pdfs(in_path, *, skip=None):
+    """
+    Iterate over all résumé PDFs under ``in_path``, in a consistent order.
+
+    Args:
+        in_path (:class:`pathlib.Path`): Path to a directory, which is walked recursively,
+            or to a .zip archive.
+        skip (Set[str] or Dict[str, str]): Filenames, relative to ``in_path``,
+            of PDFs to skip, e.g. those already finished in a previous run.
+            They're skipped *before* being read out of a .zip archive.
+
+    Yields:
+        Tuple[str, str or bytes]: Next (filename, source) pair, where filename is relative
+        to ``in_path`` and source is either the full path to the file on disk
+        or the file's contents, if stored in a .zip archive.
+    """
+    skip = skip or set()
+    if in_path.is_file() and zipfile.is_zipfile(str(in_path)):
+        with zipfile.ZipFile(str(in_path), mode="r") as zf:
+            for member in zf.infolist():
+                if (
+                    not member.is_dir() and
+                    member.filename.lower().endswith(".pdf") and
+                    member.filename not in skip
+                ):
+                    yield (member.filename, zf.read(member))
+    elif in_path.is_dir():
+        for dirpath, dirnames, filenames in os.walk(str(in_path)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.lower().endswith(".pdf"):
+                    filepath = os.path.join(dirpath, filename)
+                    fname = os.path.relpath(filepath, str(in_path))
+                    if fname not in skip:
+                        yield (fname, filepath)
+    else:
+        raise ValueError(
+            "`in_path` must be a directory or .zip archive, not {}".format(in_path)
+        )
+
+
+def extract_and_parse_pdfs(
+    items,
+    *,
+    min_text_len=150,
+    extract_timeout=None,
+    extract_max_pages=10,
+    extract_max_chars=None,
+):
+    """
+    Extract text from and parse each résumé PDF in ``items``.
+
+    Args:
+        items (List[Tuple[str, str or bytes]]): Sequence of (filename, source) pairs,
+            as produced by :func:`iter_pdfs()`.
+        min_text_len (int)
+        extract_timeout (float)
+        extract_max_pages (int)
+        extract_max_chars (int)
+
+    Returns:
+        List[Tuple[str, str, Dict[str, object]]]: Sequence of (filename, status, data)
+        triples, where status is one of "parsed", "no_text", or "failed".
+    """
+    results = []
+    for fname, source in items:
+        try:
+            text = msvdd_bloc.resumes.extract_text_from_pdf(
+                source,
+                min_len=min_text_len,
+                timeout=extract_timeout,
+                max_pages=extract_max_pages,
+                max_chars=extract_max_chars,
+            )
+            if not text:
+                LOGGER.warning("unable to extract text from %s", fname)
+                results.append((fname, "no_text", None))
+            else:
+                results.append((fname, "parsed", msvdd_bloc.resumes.parse_text(text)))
+        except Exception:
+            LOGGER.exception("unable to extract and parse %s", fname)
+            results.append((fname, "failed", None))
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main())
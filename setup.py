@@ -25,11 +25,10 @@ setuptools.setup(
         "Intended Audience :: Developers",
         "Programming Language :: Python",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
     ],
     packages=setuptools.find_packages(),
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=[
         "beautifulsoup4>=4.7.0",
         "Faker>=2.0.0",
@@ -43,7 +42,7 @@ setuptools.setup(
         "requests>=2.20.0",
         "spacy>=2.1,<2.2",
         "textacy>=0.9.0",
-        "tika>=1.19",
+        "tika>=1.23",
         "toolz>=0.10.0",
         "usaddress>=0.5.10",
         "watermark>=1.8.0",
@@ -0,0 +1,37 @@
+import probablepeople
+import pytest
+import usaddress
+
+from msvdd_bloc.resumes.basics import constants
+from msvdd_bloc.resumes.basics import parse as basics_parse
+
+
+class TestTagLocation:
+
+    def test(self):
+        text = "1234 Fake Street, City Name, XX 12345"
+        exp = usaddress.tag(text, tag_mapping=constants.LOCATION_TAG_MAPPING)
+        assert basics_parse._tag_location(text) == exp
+
+    def test_cached(self):
+        info = basics_parse.get_tag_cache_info()["location"]
+        tagged = basics_parse._tag_location("99 Another Fake St.,  New York,\tNY")
+        assert basics_parse._tag_location("99 Another Fake St., New York, NY ") is tagged
+        new_info = basics_parse.get_tag_cache_info()["location"]
+        assert new_info["misses"] == info["misses"] + 1
+        assert new_info["hits"] == info["hits"] + 1
+
+    def test_repeated_label(self):
+        text = "Chicago IL 60601 Boston MA 02101"
+        with pytest.raises(usaddress.RepeatedLabelError):
+            usaddress.tag(text, tag_mapping=constants.LOCATION_TAG_MAPPING)
+        info = basics_parse.get_tag_cache_info()["location"]
+        assert basics_parse._tag_location(text) is None
+        assert basics_parse._tag_location(text) is None
+        assert basics_parse.get_tag_cache_info()["location"]["hits"] == info["hits"] + 1
+
+
+class TestTagName:
+
+    def test(self):
+        assert basics_parse._tag_name("John  Doe") == probablepeople.tag("John Doe")
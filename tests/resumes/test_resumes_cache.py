@@ -0,0 +1,106 @@
+import os
+
+import pycrfsuite
+import pytest
+
+from msvdd_bloc.resumes import cache, parse_utils
+
+
+@pytest.fixture
+def model_filepath(tmp_path):
+    fpath = tmp_path.joinpath("model.crfsuite")
+    fpath.write_bytes(b"model")
+    return fpath
+
+
+class TestParseCache:
+
+    def test_memory(self, model_filepath):
+        parse_cache = cache.ParseCache(maxsize=2, model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data")
+        assert key == parse_cache.make_key(b"data")
+        assert key != parse_cache.make_key(b"other data")
+        assert parse_cache.get(key) is None
+        parse_cache.set(key, {"basics": {"name": "John Doe"}})
+        assert parse_cache.get(key) == {"basics": {"name": "John Doe"}}
+
+    def test_disk(self, tmp_path, model_filepath):
+        dirpath = tmp_path.joinpath("cache")
+        parse_cache = cache.ParseCache(dirpath=dirpath, model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data")
+        parse_cache.set(key, {"basics": {"name": "John Doe"}})
+        # a fresh cache has an empty memory tier, but shares the disk tier
+        parse_cache = cache.ParseCache(dirpath=dirpath, model_filepaths=[model_filepath])
+        assert parse_cache.get(key) == {"basics": {"name": "John Doe"}}
+        assert parse_cache.info()["disk_size"] > 0
+        parse_cache.clear()
+        assert parse_cache.get(key) is None
+        assert parse_cache.info()["disk_size"] == 0
+
+    def test_disk_eviction(self, tmp_path, model_filepath):
+        dirpath = tmp_path.joinpath("cache")
+        parse_cache = cache.ParseCache(
+            dirpath=dirpath, maxsize=1, max_disk_size=100, model_filepaths=[model_filepath])
+        for i in range(10):
+            parse_cache.set(parse_cache.make_key(str(i).encode()), {"basics": {"name": "x" * 20}})
+        assert 0 < parse_cache.info()["disk_size"] <= 100
+        assert 0 < len(os.listdir(str(dirpath))) < 10
+
+    def test_model_change(self, model_filepath):
+        parse_cache = cache.ParseCache(model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data")
+        parse_cache.set(key, {"basics": {"name": "John Doe"}})
+        model_filepath.write_bytes(b"retrained model")
+        new_key = parse_cache.make_key(b"data")
+        assert new_key != key
+        assert parse_cache.get(new_key) is None
+        assert parse_cache.get(key) is None
+
+    def test_model_retrained(self, tmp_path):
+        fpath = tmp_path.joinpath("model.crfsuite")
+        parse_cache = cache.ParseCache(dirpath=tmp_path.joinpath("cache"), model_filepaths=[fpath])
+        _train_tagger(fpath, "old")
+        key = parse_cache.make_key(b"data")
+        parse_cache.set(key, parse_utils.load_tagger(fpath).tag([{"w": "a"}]))
+        _train_tagger(fpath, "new")
+        new_key = parse_cache.make_key(b"data")
+        assert new_key != key
+        assert parse_cache.get(new_key) is None
+        # results cached under the new key must come from the new model
+        parse_cache.set(new_key, parse_utils.load_tagger(fpath).tag([{"w": "a"}]))
+        assert parse_cache.get(new_key) == ["new"]
+
+    def test_pipeline_change(self, model_filepath, monkeypatch):
+        parse_cache = cache.ParseCache(model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data")
+        monkeypatch.setattr(cache.parse, "PIPELINE_VERSION", cache.parse.PIPELINE_VERSION + 1)
+        assert parse_cache.make_key(b"data") != key
+
+    def test_settings(self, model_filepath):
+        parse_cache = cache.ParseCache(model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data", settings={"timeout": 1.0, "min_score": 0.6})
+        assert key == parse_cache.make_key(b"data", settings={"min_score": 0.6, "timeout": 1.0})
+        assert key != parse_cache.make_key(b"data", settings={"timeout": 2.0, "min_score": 0.6})
+        assert key != parse_cache.make_key(b"data")
+
+    def test_disk_touch_error(self, tmp_path, model_filepath, monkeypatch):
+        dirpath = tmp_path.joinpath("cache")
+        parse_cache = cache.ParseCache(dirpath=dirpath, model_filepaths=[model_filepath])
+        key = parse_cache.make_key(b"data")
+        parse_cache.set(key, {"basics": {"name": "John Doe"}})
+        parse_cache = cache.ParseCache(dirpath=dirpath, model_filepaths=[model_filepath])
+
+        def utime(*args, **kwargs):
+            raise PermissionError("read-only cache")
+
+        monkeypatch.setattr(cache.os, "utime", utime)
+        assert parse_cache.get(key) == {"basics": {"name": "John Doe"}}
+
+
+def _train_tagger(fpath, label):
+    trainer = pycrfsuite.Trainer(verbose=False)
+    trainer.append([{"w": "a"}, {"w": "b"}], [label, label])
+    trainer.train(str(fpath))
+    # models trained in quick succession may not differ in size or mtime otherwise
+    stat = os.stat(str(fpath))
+    os.utime(str(fpath), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
@@ -0,0 +1,234 @@
+import io
+import pathlib
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from msvdd_bloc.resumes import extract
+
+
+@pytest.fixture(scope="module")
+def filepath():
+    return pathlib.Path(__file__).parent.parent.joinpath("data", "fake-resume.pdf")
+
+
+@pytest.fixture(scope="module")
+def long_pdf_data():
+    """Minimal, valid 25-page PDF with "Page {n}" written on each page."""
+    n_pages = 25
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for i in range(n_pages):
+        stream = "BT /F1 12 Tf 72 720 Td (Page {}) Tj ET".format(i + 1).encode()
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objs)
+        )
+        kids.append(b"%d 0 R" % len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), n_pages)
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (i, obj)
+    xref_offset = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1, xref_offset)
+    return data
+
+
+class TestExtractTextFromPdfPdfminer:
+
+    def test_sources(self, filepath):
+        with io.open(filepath, mode="rb") as f:
+            data = f.read()
+        text = extract.extract_text_from_pdf_pdfminer(str(filepath))
+        assert text and isinstance(text, str)
+        assert extract.extract_text_from_pdf_pdfminer(filepath) == text
+        assert extract.extract_text_from_pdf_pdfminer(data) == text
+        assert extract.extract_text_from_pdf_pdfminer(io.BytesIO(data)) == text
+
+    def test_budgets(self, filepath):
+        text = extract.extract_text_from_pdf_pdfminer(filepath)
+        pages = list(extract.iter_text_from_pdf_pdfminer(filepath))
+        assert len(pages) >= 1
+        assert "".join(pages).strip() == text
+        assert extract.extract_text_from_pdf_pdfminer(filepath, max_pages=1) == pages[0].strip()
+        assert extract.extract_text_from_pdf_pdfminer(filepath, max_chars=1) == pages[0].strip()
+
+    def test_stop(self, long_pdf_data):
+        stop = threading.Event()
+        pages = []
+        for page in extract.iter_text_from_pdf_pdfminer(long_pdf_data, stop=stop):
+            pages.append(page)
+            if len(pages) == 2:
+                stop.set()
+        assert len(pages) == 2
+
+
+class TestExtractTextFromPdfTextract:
+
+    def test_budgets(self, filepath, monkeypatch):
+        pages = ["Page {}\n".format(i + 1) for i in range(25)]
+        textract = types.ModuleType("textract")
+        textract.process = lambda *args, **kwargs: "\f".join(pages).encode("utf-8")
+        monkeypatch.setitem(sys.modules, "textract", textract)
+        text = extract.extract_text_from_pdf_textract(filepath)
+        assert "Page 25" in text
+        text = extract.extract_text_from_pdf_textract(filepath, max_pages=10)
+        assert "Page 10" in text and "Page 11" not in text
+        text = extract.extract_text_from_pdf_textract(filepath.read_bytes(), max_chars=20)
+        assert "Page 3" in text and "Page 4" not in text
+
+
+class TestExtractTextFromPdfTika:
+
+    def test_timeout(self, filepath, monkeypatch):
+        tika_parser = pytest.importorskip("tika.parser")
+        calls = []
+
+        def from_file(filename, **kwargs):
+            calls.append(kwargs)
+            return {"content": "tika"}
+
+        monkeypatch.setattr(tika_parser, "from_file", from_file)
+        assert extract.extract_text_from_pdf_tika(filepath, timeout=0.5) == "tika"
+        assert extract.extract_text_from_pdf_tika(filepath) == "tika"
+        assert calls == [{"requestOptions": {"timeout": 0.5}}, {"requestOptions": {}}]
+
+
+def _make_extractor(text, delay=0.0):
+    def extractor(source, **kwargs):
+        time.sleep(delay)
+        return text
+    return extractor
+
+
+class TestExtractTextFromPdf:
+
+    def test_timeout(self, filepath, monkeypatch):
+        monkeypatch.setattr(extract, "extract_text_from_pdf_tika", _make_extractor("tika", 2.0))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_pdfminer", _make_extractor("pdfminer"))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_textract", _make_extractor("textract"))
+        start_time = time.monotonic()
+        text = extract.extract_text_from_pdf(filepath, min_len=1, min_score=0.0, timeout={"tika": 0.1})
+        assert text == "pdfminer"
+        assert time.monotonic() - start_time < 1.0
+
+    def test_timeout_priority(self, filepath, monkeypatch):
+        monkeypatch.setattr(extract, "extract_text_from_pdf_tika", _make_extractor("tika", 0.2))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_pdfminer", _make_extractor("pdfminer"))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_textract", _make_extractor(""))
+        assert extract.extract_text_from_pdf(filepath, min_len=1, min_score=0.0, timeout=1.0) == "tika"
+        assert extract.extract_text_from_pdf(filepath, min_len=10, min_score=0.0, timeout=1.0) == ""
+
+    @pytest.mark.parametrize("timeout", [None, 1.0])
+    def test_unavailable(self, filepath, monkeypatch, timeout):
+        def extractor(source, **kwargs):
+            raise AssertionError("unavailable extractor was run")
+
+        monkeypatch.setattr(extract, "_UNAVAILABLE_METHODS", frozenset(["tika", "textract"]))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_tika", extractor)
+        monkeypatch.setattr(extract, "extract_text_from_pdf_pdfminer", _make_extractor("pdfminer"))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_textract", extractor)
+        assert extract.extract_text_from_pdf(
+            filepath, min_len=1, min_score=1.1, timeout=timeout) == "pdfminer"
+
+    @pytest.mark.parametrize("timeout", [None, 1.0])
+    def test_errors(self, filepath, monkeypatch, timeout):
+        def missing_extractor(source, **kwargs):
+            raise ImportError("No module named 'textract'")
+
+        def broken_extractor(source, **kwargs):
+            raise RuntimeError("tika server is down")
+
+        monkeypatch.setattr(extract, "_UNAVAILABLE_METHODS", frozenset())
+        monkeypatch.setattr(extract, "extract_text_from_pdf_tika", broken_extractor)
+        monkeypatch.setattr(extract, "extract_text_from_pdf_pdfminer", _make_extractor("pdfminer"))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_textract", missing_extractor)
+        # pdfminer's text doesn't score high enough, so textract is tried, and fails
+        assert extract.extract_text_from_pdf(
+            filepath, min_len=1, min_score=1.1, timeout=timeout) == "pdfminer"
+
+    def test_timeout_stops_pdfminer(self, long_pdf_data, monkeypatch):
+        n_pages_processed = []
+        process_page = extract.pdfminer.pdfinterp.PDFPageInterpreter.process_page
+
+        def slow_process_page(self, page):
+            time.sleep(0.05)
+            n_pages_processed.append(1)
+            return process_page(self, page)
+
+        monkeypatch.setattr(extract, "_UNAVAILABLE_METHODS", frozenset(["tika", "textract"]))
+        monkeypatch.setattr(
+            extract.pdfminer.pdfinterp.PDFPageInterpreter, "process_page", slow_process_page)
+        text = extract.extract_text_from_pdf(
+            long_pdf_data, min_len=1, max_pages=None, timeout=0.2)
+        assert text == ""
+        # the timed-out extraction stops at its next page, rather than running on
+        time.sleep(0.5)
+        n_pages = len(n_pages_processed)
+        assert 0 < n_pages < 25
+        time.sleep(0.2)
+        assert len(n_pages_processed) == n_pages
+
+    def test_min_score(self, filepath, monkeypatch):
+        text = extract.extract_text_from_pdf_pdfminer(filepath)
+        monkeypatch.setattr(extract, "extract_text_from_pdf_tika", _make_extractor("\n".join(text)))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_pdfminer", _make_extractor(text))
+        monkeypatch.setattr(extract, "extract_text_from_pdf_textract", _make_extractor(""))
+        result, score = extract.extract_text_from_pdf(filepath, return_score=True)
+        assert result == text
+        assert score >= 0.6
+        # if nothing's good enough, fall back to the best of the rest
+        result, score = extract.extract_text_from_pdf(filepath, min_score=1.1, return_score=True)
+        assert result == text
+
+    def test_budgets(self, long_pdf_data, monkeypatch):
+        n_pages_processed = []
+        process_page = extract.pdfminer.pdfinterp.PDFPageInterpreter.process_page
+
+        def counting_process_page(self, page):
+            n_pages_processed.append(1)
+            return process_page(self, page)
+
+        monkeypatch.setattr(extract, "_UNAVAILABLE_METHODS", frozenset(["tika", "textract"]))
+        monkeypatch.setattr(
+            extract.pdfminer.pdfinterp.PDFPageInterpreter, "process_page", counting_process_page)
+        text = extract.extract_text_from_pdf(long_pdf_data, min_len=1)
+        assert "Page 10" in text and "Page 11" not in text
+        assert len(n_pages_processed) == 10
+        n_pages_processed.clear()
+        text = extract.extract_text_from_pdf(long_pdf_data, min_len=1, max_pages=None, max_chars=20)
+        assert "Page 3" in text and "Page 4" not in text
+        assert len(n_pages_processed) == 3
+        n_pages_processed.clear()
+        text = extract.extract_text_from_pdf(long_pdf_data, min_len=1, max_pages=None)
+        assert "Page 25" in text
+        assert len(n_pages_processed) == 25
+
+
+class TestScoreTextQuality:
+
+    def test_good_text(self, filepath):
+        text = extract.extract_text_from_pdf_pdfminer(filepath)
+        assert extract.score_text_quality(text) >= 0.9
+
+    def test_bad_text(self, filepath):
+        text = extract.extract_text_from_pdf_pdfminer(filepath)
+        garbled_text = "".join(
+            "(cid:{})".format(ord(char)) if not char.isspace() else char for char in text
+        )
+        assert extract.score_text_quality("\n".join(text)) < 0.6
+        assert extract.score_text_quality(garbled_text) < 0.6
+        assert extract.score_text_quality("") == 0.0
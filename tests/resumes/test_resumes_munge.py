@@ -53,6 +53,21 @@ def test_normalize_text(text):
     assert regexes.RE_BULLETS.search(norm_text) is None
 
 
+@pytest.mark.parametrize(
+    "text,exp_norm_text",
+    [
+        ("plain ascii text\nwith   two lines\n", "plain ascii text\nwith   two lines"),
+        ("R&D Engineer\nSkills: Python & SQL", "R&D Engineer\nSkills: Python & SQL"),
+        ("CafÃ© &amp; Bar\nplain line\n● bullet", "Café & Bar\nplain line\n- bullet"),
+        ("It’s\r\nfine\xa0here\x0bok", "It's\nfine hereok"),
+        ("<b>R&amp;D</b>\n&amp;", "<b>R&amp;D</b>\n&amp;"),
+        ("ﬁne\tline\x0cnext", "fine line next"),
+    ],
+)
+def test_normalize_text_mixed_lines(text, exp_norm_text):
+    assert munge.normalize_text(text) == exp_norm_text
+
+
 def test_get_filtered_text_lines(text):
     norm_text = munge.normalize_text(text)
     lines = norm_text.split("\n")
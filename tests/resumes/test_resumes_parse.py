@@ -0,0 +1,96 @@
+import concurrent.futures
+import gc
+
+import pytest
+
+from msvdd_bloc.resumes import parse, parse_utils
+
+
+@pytest.fixture(scope="module")
+def texts():
+    text = """
+John Doe
+1234 Fake Street, City Name, XX 12345  |  555-555-5555  |  foo.bar@fake.com
+
+EXPERIENCE
+Some Company, Senior Job Title
+New York, NY       Jan 2018 – Mar 2019
+● Here is a summary of my responsibilities while I worked at Some Company
+
+EDUCATION
+University of Fake Name
+B.A. in Computer Science    Sep 2012 - June 2016
+
+SKILLS
+● Languages: HTML, CSS, JavaScript, Python
+"""
+    return [text, "", text.replace("John Doe", "Jane Roe"), text.upper()]
+
+
+class TestParseText:
+
+    def test_stats(self, texts):
+        stats = parse_utils.ParseStats()
+        assert parse.parse_text(texts[0], stats=stats) == parse.parse_text(texts[0])
+        stats_dict = stats.to_dict()
+        for stage in ["normalize", "segment", "tokenize", "work.tag", "validate"]:
+            assert stage in stats_dict["timings"]
+        assert stats_dict["counts"]["n_chars"] == len(texts[0])
+        assert stats_dict["counts"]["basics.n_tokens"] > 0
+
+    def test_threads(self, texts):
+        exp_results = [parse.parse_text(text) for text in texts] * 5
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            obs_results = list(executor.map(parse.parse_text, texts * 5))
+        assert obs_results == exp_results
+
+    def test_validate(self, texts):
+        for text in texts:
+            result = parse.parse_text(text, validate="full")
+            assert parse.parse_text(text, validate="fast") == result
+        assert parse.parse_text(texts[0], validate="off")
+
+    def test_validate_off_stats(self, texts):
+        stats = parse_utils.ParseStats()
+        parse.parse_text(texts[0], stats=stats, validate="off")
+        assert "validate" not in stats.to_dict()["timings"]
+
+    def test_bad_validate(self, texts):
+        with pytest.raises(ValueError):
+            parse.parse_text(texts[0], validate="yes")
+
+
+class TestParseTexts:
+
+    def test_single_process(self, texts):
+        obs_results = list(parse.parse_texts(texts, n_process=1, chunk_size=2))
+        exp_results = [parse.parse_text(text) for text in texts]
+        assert obs_results == exp_results
+
+    def test_multi_process(self, texts):
+        obs_results = list(parse.parse_texts(texts, n_process=2, chunk_size=1))
+        exp_results = [parse.parse_text(text) for text in texts]
+        assert obs_results == exp_results
+
+    def test_validate(self, texts):
+        obs_results = list(parse.parse_texts(texts, chunk_size=2, validate="fast"))
+        exp_results = [parse.parse_text(text, validate="fast") for text in texts]
+        assert obs_results == exp_results
+
+    def test_bad_n_process(self, texts):
+        with pytest.raises(ValueError):
+            list(parse.parse_texts(texts, n_process=0))
+
+
+class TestWarmUp:
+
+    def test(self, texts):
+        parse.warm_up(freeze=False)
+        assert parse.parse_text(texts[0])
+
+    def test_freeze(self):
+        try:
+            parse.warm_up(freeze=True)
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.unfreeze()
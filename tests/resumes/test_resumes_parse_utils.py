@@ -1,8 +1,11 @@
+import concurrent.futures
+import os
+
 import pycrfsuite
 import pytest
 from spacy.tokens import Token
 
-from msvdd_bloc import tokenize
+from msvdd_bloc import tokenize, utils
 from msvdd_bloc.resumes import basics, education, skills
 from msvdd_bloc.resumes import parse_utils
 
@@ -18,6 +21,59 @@ class TestLoadTagger:
         with pytest.raises(IOError):
             parse_utils.load_tagger(tmp_path.joinpath("foo.crfsuite"))
 
+    def test_per_thread(self):
+        tagger = parse_utils.load_tagger(skills.FPATH_TAGGER)
+        assert parse_utils.load_tagger(str(skills.FPATH_TAGGER)) is tagger
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            thread_tagger = executor.submit(parse_utils.load_tagger, skills.FPATH_TAGGER).result()
+        assert thread_tagger is not tagger
+        assert thread_tagger.labels() == tagger.labels()
+
+    def test_retrained(self, tmp_path):
+        fpath = tmp_path.joinpath("model.crfsuite")
+        _train_tagger(fpath, "old")
+        tagger = parse_utils.load_tagger(fpath)
+        assert tagger.tag([{"w": "a"}]) == ["old"]
+        assert parse_utils.load_tagger(fpath) is tagger
+        _train_tagger(fpath, "new")
+        new_tagger = parse_utils.load_tagger(fpath)
+        assert new_tagger is not tagger
+        assert new_tagger.tag([{"w": "a"}]) == ["new"]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            thread_tagger = executor.submit(parse_utils.load_tagger, fpath).result()
+        assert thread_tagger.tag([{"w": "a"}]) == ["new"]
+
+
+def _train_tagger(fpath, label):
+    trainer = pycrfsuite.Trainer(verbose=False)
+    trainer.append([{"w": "a"}, {"w": "b"}], [label, label])
+    trainer.train(str(fpath))
+    # models trained in quick succession may not differ in size or mtime otherwise
+    stat = os.stat(str(fpath))
+    os.utime(str(fpath), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+class TestParseStats:
+
+    def test(self):
+        stats = parse_utils.ParseStats()
+        with stats.timer("stage"):
+            pass
+        with stats.timer("stage"):
+            pass
+        stats.count("n_items", 2)
+        stats.count("n_items")
+        stats_dict = stats.to_dict()
+        assert list(stats_dict["timings"].keys()) == ["stage"]
+        assert stats_dict["timings"]["stage"] >= 0.0
+        assert stats_dict["counts"] == {"n_items": 3}
+
+    def test_null(self):
+        stats = parse_utils.NULL_STATS
+        with stats.timer("stage"):
+            stats.count("n_items")
+        assert stats.to_dict() == {"timings": {}, "counts": {}}
+
 
 class TestPadTokensFeatures:
 
@@ -39,6 +95,110 @@ class TestPadTokensFeatures:
         assert all(tf == {"_end": True} for tf in tfs_padded[-1:])
 
 
+class TestFlattenFeatures:
+
+    def test(self):
+        features = {"shape": "Xxx", "len": 3, "is_alpha": True, "is_digit": False}
+        assert parse_utils.flatten_features(features) == {
+            "shape:Xxx": 1.0, "len": 3.0, "is_alpha": 1.0,
+        }
+
+    def test_nested(self):
+        features = {"prev": {"shape": "xx", "is_alpha": True, "_start": True}}
+        assert parse_utils.flatten_features(features) == {
+            "prev:shape:xx": 1.0, "prev:is_alpha": 1.0, "prev:_start": 1.0,
+        }
+
+    def test_matches_pycrfsuite(self):
+        features = {"idx": 2, "shape": "dd", "prev": {"idx": 1, "like_num": False}}
+        exp_attrs = {
+            key: value
+            for key, value in pycrfsuite.ItemSequence([features]).items()[0].items()
+            if value != 0.0
+        }
+        assert parse_utils.flatten_features(features) == exp_attrs
+
+
+class TestGetLexicalFeatures:
+
+    def test(self):
+        tokens = tokenize.tokenize("Foo, bar, foo.")
+        cache = utils.LRUCache()
+        tokens_lex_features = parse_utils.get_lexical_features(
+            tokens, parse_utils.get_token_features_base, cache=cache)
+        assert len(tokens_lex_features) == len(tokens)
+        assert cache.info()["misses"] == 5
+        assert cache.info()["hits"] == 1
+        # repeated token texts share the same cached features
+        assert tokens_lex_features[1] is tokens_lex_features[3]
+        features, attrs, neighbors_attrs = tokens_lex_features[0]
+        assert "idx" not in features and "idx" not in attrs
+        assert attrs == parse_utils.flatten_features(features)
+        assert neighbors_attrs[0] == {"ppprev:" + key: val for key, val in attrs.items()}
+
+
+class TestGetFeatureItems:
+
+    def test_singleton(self):
+        tokens = tokenize.tokenize("x")
+        tokens_lex_features = parse_utils.get_lexical_features(
+            tokens, parse_utils.get_token_features_base, cache=utils.LRUCache())
+        items = parse_utils.get_feature_items(tokens_lex_features).items()
+        assert len(items) == 1
+        assert items[0]["_singleton"] == 1.0
+        assert not any(key.startswith("prev:") for key in items[0])
+
+    def test_matches_nested_features(self):
+        tokens = tokenize.tokenize("- foo Bar\n2019")
+        tfs = [parse_utils.get_token_features_base(token) for token in tokens]
+        seq_tfs = [{"tok_line_idx": idx, "follows_bullet": False} for idx in range(len(tfs))]
+        tokens_lex_features = parse_utils.get_lexical_features(
+            tokens, parse_utils.get_token_features_base, cache=utils.LRUCache())
+        obs_items = parse_utils.get_feature_items(tokens_lex_features, seq_tfs).items()
+        padded_tfs = parse_utils.pad_tokens_features(tfs, n_left=3, n_right=2)
+        nested_tfs = [
+            {
+                **tf,
+                "ppprev": padded_tfs[idx],
+                "pprev": padded_tfs[idx + 1],
+                "prev": padded_tfs[idx + 2],
+                "next": padded_tfs[idx + 4],
+                "nnext": padded_tfs[idx + 5],
+                **seq_tf,
+            }
+            for idx, (tf, seq_tf) in enumerate(zip(tfs, seq_tfs))
+        ]
+        exp_items = [
+            [(key, value) for key, value in item.items() if value != 0.0]
+            for item in pycrfsuite.ItemSequence(nested_tfs).items()
+        ]
+        # same attributes *in the same order*, so tagger scores are identical
+        assert [list(item.items()) for item in obs_items] == exp_items
+        assert obs_items[0]["ppprev:_start"] == 1.0
+        assert obs_items[-1]["nnext:_end"] == 1.0
+        assert obs_items[1]["prev:shape:-"] == 1.0
+
+
+class TestGetLineYears:
+
+    @pytest.mark.parametrize(
+        "years,exp",
+        [
+            ([], (None, 0, 0)),
+            (["2019"], (2019, 1, 1)),
+            (["2017", "2019", "2018"], (2019, 1, 3)),
+            (["2019", "2017", "2019"], (2019, 2, 3)),
+        ]
+    )
+    def test(self, years, exp):
+        tokens_features = [
+            {"like_year": True, "prefix": year[0], "suffix": year[-3:]} for year in years
+        ]
+        tokens_features.insert(0, {"like_year": False, "prefix": "F", "suffix": "foo"})
+        line_tok_idxs = range(len(tokens_features))
+        assert parse_utils.get_line_years(tokens_features, line_tok_idxs) == exp
+
+
 class TestGetTokenFeaturesBase:
 
     def test_token(self):
@@ -195,3 +355,21 @@ class TestGetTokenFeaturesBase:
             "is_partial_punct": True,
         }
         assert obs_features == exp_features
+
+    @pytest.mark.parametrize(
+        "text,exp_newline,exp_partial_digit,exp_partial_punct",
+        [
+            ("\n\n", True, False, False),
+            ("x2", False, True, False),
+            ("22", False, False, False),
+            ("--", False, False, False),
+            ("a-b", False, False, True),
+            ("$2.50", False, True, True),
+        ]
+    )
+    def test_token_text_features(self, text, exp_newline, exp_partial_digit, exp_partial_punct):
+        token = tokenize.tokenize([text])[0]
+        obs_features = parse_utils.get_token_features_base(token)
+        assert obs_features["is_newline"] is exp_newline
+        assert obs_features["is_partial_digit"] is exp_partial_digit
+        assert obs_features["is_partial_punct"] is exp_partial_punct
@@ -96,3 +96,39 @@ def test_get_section_lines(filtered_text_lines):
     assert sorted(obs_lines.keys()) == sorted(exp_lines.keys())
     for key in exp_lines.keys():
         assert obs_lines[key] == exp_lines[key]
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "EXPERIENCE",
+        "Education:",
+        "Relevant coursework:",
+        "Skills: Python, SQL, Excel",
+        "Technical Skills",
+        "Technical Skills and Interests",
+        "Skills & Activities",
+        "Honors, Awards, and Memberships: Dean's List",
+        "Leadership",
+        "Leadership & Service",
+        "Projects",
+        "References available upon request",
+        "- Skills",
+        "",
+        "Languages: " + "English, Spanish, French, German, Italian, Portuguese, " * 2,
+    ],
+)
+def test_match_section_header(line):
+    exp_match = None
+    for section, pattern in segment.SECTION_HEADERS.items():
+        match = pattern.match(line)
+        if match:
+            exp_match = (section, match.group("end"), match.end())
+            break
+    header = segment.match_section_header(line)
+    if header is None:
+        obs_match = None
+    else:
+        section, match = header
+        obs_match = (section, match.group(section + "_end"), match.end())
+    assert obs_match == exp_match
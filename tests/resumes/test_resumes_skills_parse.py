@@ -0,0 +1,73 @@
+import itertools
+import re
+
+import pytest
+
+from msvdd_bloc import tokenize
+from msvdd_bloc.resumes.skills import parse as skills_parse
+
+
+# shape patterns as originally matched against concatenated labels, in priority order
+LABELS_STR_SHAPES = [
+    ("junk", r"^(level)+(field_sep)*?$"),
+    ("junk", r"^(name)+(field_sep)+$"),
+    ("names", r"^(name|keyword)+$"),
+    ("name_level", r"^(name)+(field_sep)+(level)+(field_sep)*?$"),
+    ("names_delimited", r"^(name)+((item_sep)+(name|keyword)+)+$"),
+    ("names_levels", r"^((name)+((field_sep)+(level)+(field_sep)+)?(item_sep)*?)+$"),
+    ("name_keywords", r"^(name)+(field_sep)+(keyword)+((item_sep)+(keyword|name)+)*?$"),
+    ("level_names_explicit", r"^(level)+(field_sep)+(name|keyword)+((item_sep)+(name|keyword)+)*?$"),
+    ("level_names_implicit", r"^(level)+(name)+((item_sep)+(name|keyword)+)*?$"),
+    ("name_names_levels", r"^(name)+(field_sep)+((name|keyword)+((field_sep)+(level)+(field_sep)*?)?(item_sep)*?)+$"),
+]
+
+
+def _get_labels_str_shape(labels):
+    labels_str = "".join(labels)
+    for shape, pattern in LABELS_STR_SHAPES:
+        if re.search(pattern, labels_str):
+            return shape
+    return None
+
+
+class TestGetLabelsShape:
+
+    @pytest.mark.parametrize(
+        "labels,exp_shape",
+        [
+            (["level", "field_sep"], "junk"),
+            (["name", "keyword", "name"], "names"),
+            (["name", "name", "field_sep", "level"], "name_level"),
+            (["name", "item_sep", "keyword", "item_sep", "name"], "names_delimited"),
+            (["name", "field_sep", "level", "field_sep", "item_sep", "name"], "names_levels"),
+            (["name", "field_sep", "keyword", "item_sep", "keyword"], "name_keywords"),
+            (["level", "field_sep", "keyword", "item_sep", "name"], "level_names_explicit"),
+            (["level", "name", "item_sep", "keyword"], "level_names_implicit"),
+            (["name", "field_sep", "name", "field_sep", "level", "item_sep", "keyword"], "name_names_levels"),
+            (["item_sep", "level", "item_sep"], None),
+        ]
+    )
+    def test(self, labels, exp_shape):
+        assert skills_parse._get_labels_shape(labels) == exp_shape
+
+    def test_matches_labels_str(self):
+        labels = ("name", "keyword", "level", "field_sep", "item_sep")
+        for n in range(1, 6):
+            for seq in itertools.product(labels, repeat=n):
+                assert skills_parse._get_labels_shape(seq) == _get_labels_str_shape(seq)
+
+    def test_long(self):
+        # this would backtrack (practically) forever with the labels string patterns
+        labels = ["name", "field_sep"] + ["name", "keyword"] * 1000 + ["item_sep", "field_sep"]
+        assert skills_parse._get_labels_shape(labels) is None
+
+
+class TestFeaturize:
+
+    def test_follows_group_sep(self):
+        tokens = tokenize.tokenize("- Languages: Python, SQL\n: Tools: Git")
+        items = skills_parse.featurize(tokens).items()
+        obs = [item.get("follows_group_sep", 0.0) == 1.0 for item in items]
+        # group separators right after a newline (e.g. bullets) don't count
+        exp = [False, False, False, True, True, True, False, False, False, False, True]
+        assert obs == exp
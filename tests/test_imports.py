@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+import msvdd_bloc
+
+
+def _get_newly_imported_modules(code, modules):
+    """
+    Run ``code`` in a fresh interpreter, and get those of ``modules``
+    that weren't already imported at startup but were imported by it.
+    """
+    code = (
+        "import sys\n"
+        "_modules = set(sys.modules)\n"
+        "{}\n"
+        "print(','.join(m for m in {!r} if m in sys.modules and m not in _modules))"
+    ).format(code, modules)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    ).stdout.strip()
+    return set(output.split(",")) - {""}
+
+
+@pytest.mark.parametrize(
+    "code,modules",
+    [
+        ("import msvdd_bloc", ["bs4", "faker", "requests", "spacy", "tika"]),
+        ("import msvdd_bloc.resumes", ["bs4", "faker", "requests", "spacy", "tika"]),
+        # NOTE: spacy itself imports requests, so it's not checked for here
+        ("from msvdd_bloc.resumes import parse", ["bs4", "faker", "tika"]),
+        ("import msvdd_bloc; msvdd_bloc.resumes.parse_text", ["bs4", "faker", "tika"]),
+    ],
+)
+def test_parse_only_imports(code, modules):
+    assert _get_newly_imported_modules(code, modules) == set()
+
+
+def test_lazy_imports():
+    code = "import msvdd_bloc; msvdd_bloc.resumes.work.generate"
+    assert _get_newly_imported_modules(code, ["faker"]) == {"faker"}
+    code = "import msvdd_bloc; msvdd_bloc.job_postings"
+    assert _get_newly_imported_modules(code, ["bs4"]) == {"bs4"}
+
+
+def test_lazy_attrs():
+    assert msvdd_bloc.resumes.parse_text is msvdd_bloc.resumes.parse.parse_text
+    assert "ParseCache" in dir(msvdd_bloc.resumes)
+    assert "tokenize" in dir(msvdd_bloc)
+    with pytest.raises(AttributeError):
+        msvdd_bloc.foo
+    with pytest.raises(AttributeError):
+        msvdd_bloc.resumes.foo
@@ -0,0 +1,68 @@
+import marshmallow as ma
+import pytest
+
+from msvdd_bloc import schemas
+
+
+DATAS = [
+    {},
+    {
+        "basics": {
+            "name": "John Doe",
+            "email": "john@example.com",
+            "phone": "(912) 555-4321",
+            "website": "johndoe.com",
+            "location": {"city": "San Francisco", "postalCode": "94115"},
+            "profiles": [{"network": "Twitter", "url": "http://twitter.com/john"}],
+        },
+        "work": [{"company": "Company", "highlights": ["Started the company"]}],
+        "awards": [{"title": "Award", "date": "2014-11-01"}],
+    },
+    {
+        "basics": {"name": "JD", "email": "not an email", "foo": "bar"},
+        "work": [
+            {"company": "Company", "summary": "too short", "highlights": ["ok", 1, None]},
+            {"position": None},
+            "not a dict",
+        ],
+        "education": "not a list",
+        "skills": [{"name": "Python", "keywords": "not a list"}],
+        "awards": [{"date": "not a date"}],
+        "unknown": "excluded",
+    },
+    {"basics": {"name": 100}, "skills": [{"keywords": [1, 2]}]},
+    {"basics": "not a dict", "interests": []},
+]
+
+
+def _load_with_schema(schema, data):
+    try:
+        return (schema.load(data), {})
+    except ma.ValidationError as e:
+        return (e.valid_data, e.messages)
+
+
+class TestCompileLoader:
+
+    @pytest.mark.parametrize("data", DATAS)
+    def test_matches_schema(self, data):
+        schema = schemas.ResumeSchema()
+        load = schemas.compile_loader(schema)
+        exp_result, exp_errors = _load_with_schema(schema, data)
+        obs_result, obs_errors = load(data)
+        assert obs_result == exp_result
+        assert list(obs_result.keys()) == list(exp_result.keys())
+        assert obs_errors.keys() == exp_errors.keys()
+
+    def test_required(self):
+        schema = schemas.JobPostingSchema()
+        load = schemas.compile_loader(schema)
+        data = {"title": "Job Title", "location": ["NYC"], "base_salary": "bad"}
+        exp_result, exp_errors = _load_with_schema(schema, data)
+        obs_result, obs_errors = load(data)
+        assert obs_result == exp_result
+        assert obs_errors.keys() == exp_errors.keys() == {"company", "date_posted", "base_salary"}
+
+    def test_many_schema(self):
+        with pytest.raises(ValueError):
+            schemas.compile_loader(schemas.ResumeSchema(many=True))
@@ -48,3 +48,60 @@ class TestTokenize:
             all(isinstance(tok, Token) for tok in tokens)
         )
         assert [tok.text for tok in tokens] == exp_texts
+
+
+class TestTokenizeSections:
+
+    def test(self):
+        texts = [
+            "John Doe\n555-123-4567",
+            "",
+            "Some Company, Senior Job Title\nJan 2018 – Mar 2019",
+            "- Python, Java\n- worked there 2012–2015.",
+        ]
+        obs_tokens = tokenize.tokenize_sections(texts)
+        exp_tokens = [tokenize.tokenize(text) for text in texts]
+        assert len(obs_tokens) == len(exp_tokens)
+        for obs_toks, exp_toks in zip(obs_tokens, exp_tokens):
+            assert all(isinstance(tok, Token) for tok in obs_toks)
+            assert (
+                [tok.text_with_ws for tok in obs_toks] ==
+                [tok.text_with_ws for tok in exp_toks]
+            )
+
+    def test_empty(self):
+        assert tokenize.tokenize_sections([]) == []
+        assert tokenize.tokenize_sections(["", ""]) == [[], []]
+
+
+class TestTokenizeMany:
+
+    def test(self):
+        lines = [
+            "This is an example line.",
+            ["This", "is", "an", "example", "line", "."],
+            "",
+            "Call me at 555-123-4567 ASAP.",
+        ]
+        obs_tokens = list(tokenize.tokenize_many(lines, batch_size=2))
+        exp_tokens = [tokenize.tokenize(line) for line in lines]
+        assert len(obs_tokens) == len(exp_tokens)
+        for obs_toks, exp_toks in zip(obs_tokens, exp_tokens):
+            assert all(isinstance(tok, Token) for tok in obs_toks)
+            assert [tok.text for tok in obs_toks] == [tok.text for tok in exp_toks]
+
+    def test_sections(self):
+        texts_groups = [["John Doe", "", "Python, Java"], ["Jane Roe\n555-123-4567"], []]
+        obs_tokens = list(tokenize.tokenize_sections_many(texts_groups, batch_size=2))
+        exp_tokens = [tokenize.tokenize_sections(texts) for texts in texts_groups]
+        assert len(obs_tokens) == len(exp_tokens)
+        for obs_group, exp_group in zip(obs_tokens, exp_tokens):
+            assert (
+                [[tok.text for tok in toks] for toks in obs_group] ==
+                [[tok.text for tok in toks] for toks in exp_group]
+            )
+
+    def test_bad_type(self):
+        with pytest.raises(TypeError):
+            list(tokenize.tokenize_many([1, 2, 3]))
+
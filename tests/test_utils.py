@@ -25,3 +25,42 @@ def test_dedupe_results():
         assert deduped_results
         assert len(deduped_results) <= len(results)
         assert len(set(result[dupe_key] for result in results)) == len(deduped_results)
+
+
+def _double_all(items):
+    return [item * 2 for item in items]
+
+
+def test_map_chunks():
+    items = list(range(23))
+    for n_process in [1, 2]:
+        for chunk_size in [1, 5, 50]:
+            results = list(
+                utils.map_chunks(_double_all, iter(items), chunk_size=chunk_size, n_process=n_process)
+            )
+            assert results == [item * 2 for item in items]
+
+
+class TestLRUCache:
+
+    def test_get_set(self):
+        cache = utils.LRUCache(maxsize=2)
+        assert cache.get("a") is None
+        assert cache.get("a", default=0) == 0
+        cache.set("a", 1)
+        assert "a" in cache
+        assert cache.get("a") == 1
+        assert cache.info() == {"hits": 1, "misses": 2, "size": 1, "maxsize": 2}
+
+    def test_eviction(self):
+        cache = utils.LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert len(cache) == 2
+        assert "a" in cache and "c" in cache and "b" not in cache
+
+    def test_bad_maxsize(self):
+        with pytest.raises(ValueError):
+            utils.LRUCache(maxsize=0)
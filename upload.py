@@ -1,20 +1,48 @@
+import collections
+import concurrent.futures
+import concurrent.futures.process
 import os
+import threading
+import uuid
 import msvdd_bloc.resumes
 from flask import Flask, flash, request, redirect, url_for, jsonify, render_template, send_from_directory
-from werkzeug.utils import secure_filename
 from PyPDF2 import PdfFileReader, PdfFileWriter
-import json
 
 
 UPLOAD_FOLDER = os.path.dirname(os.path.abspath(__file__)) + '/uploads/'
 DOWNLOAD_FOLDER = os.path.dirname(os.path.abspath(__file__)) + '/downloads/'
 ALLOWED_EXTENSIONS = {'pdf'}
+# parse jobs are handled by a local pool of worker processes, per web worker
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+MAX_QUEUE_DEPTH = int(os.getenv('MAX_QUEUE_DEPTH', 32))
+MAX_FINISHED_JOBS = int(os.getenv('MAX_FINISHED_JOBS', 1000))
+# if set, text extraction methods are raced concurrently, each for at most this many seconds
+EXTRACT_TIMEOUT = float(os.getenv('EXTRACT_TIMEOUT')) if os.getenv('EXTRACT_TIMEOUT') else None
+# text is extracted from at most this many pages (and chars, if set) per PDF
+EXTRACT_MAX_PAGES = int(os.getenv('EXTRACT_MAX_PAGES', 10))
+EXTRACT_MAX_CHARS = int(os.getenv('EXTRACT_MAX_CHARS')) if os.getenv('EXTRACT_MAX_CHARS') else None
+# extraction settings affect parse results, so they're also part of cache keys
+EXTRACT_KWARGS = {
+    'timeout': EXTRACT_TIMEOUT,
+    'max_pages': EXTRACT_MAX_PAGES,
+    'max_chars': EXTRACT_MAX_CHARS,
+}
+# parse results are cached by file contents, in memory and (optionally) on disk
+PARSE_CACHE = msvdd_bloc.resumes.ParseCache(
+    dirpath=os.getenv('PARSE_CACHE_DIR') or None,
+    maxsize=int(os.getenv('PARSE_CACHE_SIZE', 256)),
+    max_disk_size=int(os.getenv('PARSE_CACHE_DISK_SIZE', 256 * 1024 ** 2)),
+)
 
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['DOWNLOAD_FOLDER'] = DOWNLOAD_FOLDER
 
+jobs = collections.OrderedDict()
+jobs_lock = threading.Lock()
+_executor = None
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -33,9 +61,7 @@ def upload_file():
             flash('No selected file')
             return redirect(request.url)
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-            json_resume = processFile(os.path.join(app.config['UPLOAD_FOLDER'], filename), filename)
+            json_resume = processFile(file)
             # redirect("/", code=302)
             return json_resume
 
@@ -47,14 +73,144 @@ def uploaded_file(filename):
     return send_from_directory(app.config['DOWNLOAD_FOLDER'], filename, as_attachment=True)
     redirect('/')
 
-def processFile(path, filename):
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """Queue an uploaded PDF for parsing and immediately return the new job's id."""
+    file = request.files.get('file')
+    if not file or not allowed_file(file.filename):
+        return jsonify({'error': 'a .pdf file is required'}), 400
+    # fail fast, before reading anything, if there's no room for another job
+    if queue_depth() >= MAX_QUEUE_DEPTH:
+        return jsonify({'error': 'job queue is full', **queue_stats()}), 503
+    job_id = uuid.uuid4().hex
+    data = file.read()
+    cache_key = PARSE_CACHE.make_key(data, settings=EXTRACT_KWARGS)
+    resume_data = PARSE_CACHE.get(cache_key)
+    # check for room and register the job all at once, so concurrent requests
+    # can't all squeeze past the check and overrun the queue
+    with jobs_lock:
+        is_full = count_pending_jobs() >= MAX_QUEUE_DEPTH
+        if not is_full:
+            if resume_data is not None:
+                future = concurrent.futures.Future()
+                future.set_result(resume_data)
+            else:
+                future = submit_parse(data)
+                future.add_done_callback(lambda f: cache_job_result(cache_key, f))
+            jobs[job_id] = future
+            evict_finished_jobs()
+    if is_full:
+        return jsonify({'error': 'job queue is full', **queue_stats()}), 503
+    return jsonify({'id': job_id, 'status': 'queued'}), 202, {'Location': url_for('get_job', job_id=job_id)}
+
+
+@app.route('/jobs', methods=['GET'])
+def get_jobs():
+    return jsonify(queue_stats())
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    with jobs_lock:
+        future = jobs.get(job_id)
+    if future is None:
+        return jsonify({'error': 'no such job', 'id': job_id}), 404
+    if not future.done():
+        return jsonify({'id': job_id, 'status': 'running' if future.running() else 'queued'})
+    elif future.exception() is not None:
+        return jsonify({'id': job_id, 'status': 'failed', 'error': str(future.exception())})
+    else:
+        return jsonify({'id': job_id, 'status': 'done', 'result': future.result()})
+
+
+def get_executor():
+    # created lazily, so that each (forked) web worker process gets a pool of its own
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ProcessPoolExecutor(max_workers=JOB_WORKERS)
+    return _executor
+
+
+def submit_parse(data):
+    """Submit a parse job to the worker pool, replacing the pool first if a worker
+    has died (e.g. on a pathological PDF) and broken it; caller must hold ``jobs_lock``."""
+    try:
+        return get_executor().submit(parseFile, data)
+    except concurrent.futures.process.BrokenProcessPool:
+        app.logger.warning('job worker pool is broken; replacing it')
+        reset_executor()
+        return get_executor().submit(parseFile, data)
+
+
+def reset_executor():
+    """Drop the current (broken) worker pool, failing any of its jobs that haven't
+    already been failed, so a new pool is created on next use; caller must hold ``jobs_lock``."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    for future in jobs.values():
+        if not future.done():
+            try:
+                future.set_exception(concurrent.futures.process.BrokenProcessPool(
+                    'job worker pool broke before this job finished'))
+            except concurrent.futures.InvalidStateError:
+                # the job finished (or failed) just now, on its own
+                pass
+
+
+def queue_depth():
+    """Number of submitted jobs that haven't finished yet."""
+    with jobs_lock:
+        return count_pending_jobs()
+
+
+def count_pending_jobs():
+    """Number of submitted jobs that haven't finished yet; caller must hold ``jobs_lock``."""
+    return sum(1 for future in jobs.values() if not future.done())
+
+
+def queue_stats():
+    with jobs_lock:
+        return {
+            'queue_depth': count_pending_jobs(),
+            'max_queue_depth': MAX_QUEUE_DEPTH,
+            'workers': JOB_WORKERS,
+            'jobs': len(jobs),
+        }
+
+
+def evict_finished_jobs():
+    """Forget the oldest finished jobs, so that memory use doesn't grow without bound;
+    caller must hold ``jobs_lock``."""
+    n_finished = sum(1 for future in jobs.values() if future.done())
+    for job_id in list(jobs.keys()):
+        if n_finished <= MAX_FINISHED_JOBS:
+            break
+        if jobs[job_id].done():
+            del jobs[job_id]
+            n_finished -= 1
+
+
+def cache_job_result(cache_key, future):
+    if not future.cancelled() and future.exception() is None:
+        PARSE_CACHE.set(cache_key, future.result())
+
+
+def parseFile(data):
+    # extract straight from the uploaded bytes, without a round-trip to disk
+    resume_text = msvdd_bloc.resumes.extract_text_from_pdf(data, **EXTRACT_KWARGS)
+    return msvdd_bloc.resumes.parse_text(resume_text)
+
+
+def processFile(file):
     # output = PdfFileWriter()
-    resume_text = msvdd_bloc.resumes.extract_text_from_pdf(path)
-    resume_data = msvdd_bloc.resumes.parse_text(resume_text)
-    with open(filename + '.json', 'w') as json_file:
-        json.dump(resume_data, json_file)
-        output_stream = app.config['DOWNLOAD_FOLDER'] + filename 
-        json_file.write(output_stream)
+    data = file.read()
+    cache_key = PARSE_CACHE.make_key(data, settings=EXTRACT_KWARGS)
+    resume_data = PARSE_CACHE.get(cache_key)
+    if resume_data is None:
+        resume_data = parseFile(data)
+        PARSE_CACHE.set(cache_key, resume_data)
     return jsonify(resume_data)
     # redirect('/uploads')
 